@@ -1,10 +1,14 @@
 # Short absurd news headline
 
+import argparse
+
 import tracery
 from tracery.modifiers import base_english
 
+from bulk_tracery import add_bulk_arguments, run_bulk
+
 # 1. Defining Grammar
-grammar = tracery.Grammar({
+rules = {
     # starting rule: A location reports an absurd event
     'origin': ["#Location# reports: #Subject# #Verb# #Object# because of #Reason#."],
     
@@ -14,8 +18,18 @@ grammar = tracery.Grammar({
     'Verb': ["kidnapped", "digitized", "refuses", "hypnotizes", "clones", "swapped"],
     'Object': ["the Key", "the Password", "the Cat", "the Coffee", "the Truth", "the Final Mug"],
     'Reason': ["too many Emojis", "forgotten Passwords", "unexplained Silence", "the attempt to fly", "a missing Semicolon", "a faulty algorithm"]
-})
+}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Absurd news headlines")
+    add_bulk_arguments(parser)
+    args = parser.parse_args()
+
+    if args.bulk or args.benchmark:
+        run_bulk(rules, args)
+    else:
+        grammar = tracery.Grammar(rules)
 
-for i in range(10):
-    output = grammar.flatten('#origin#')
-    print(f"{i+1}. {output}")
+        for i in range(10):
+            output = grammar.flatten('#origin#')
+            print(f"{i+1}. {output}")
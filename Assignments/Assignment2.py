@@ -1,10 +1,17 @@
-import spacy
-import tracery
-from tracery.modifiers import base_english
+import argparse
+import hashlib
+import importlib.metadata
+import json
+import os
 import random
 import sys
 import time
 
+import tracery
+from tracery.modifiers import base_english
+
+from bulk_tracery import add_bulk_arguments, run_bulk
+
 # --- added a typing effect, because it looks better ---
 def type_writer(text, speed=0.04):
     """
@@ -17,14 +24,11 @@ def type_writer(text, speed=0.04):
         time.sleep(speed)
     print() # Add a line break at the end
 
-# --- loading spacy library and text ---
-print("🔮 Gazing into the void (Loading spaCy)...")
-nlp = spacy.load("en_core_web_md")
+MODEL = "en_core_web_md"
 
-# Note for myself: using forward slashes to avoid errors (because in my explorer it shows backslashes)
-file_path = "C:/Users/arne/Chatbots/NLP-Chatbots/texts/horoscope.txt"
-text = open(file_path, encoding="utf-8", errors="ignore").read()
-doc = nlp(text)
+# the texts/ folder of this repo (works from any working directory, on any OS)
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "texts")
+CACHE_NAME = ".harvest_cache.json"
 
 # --- banning some words, because of my lazy copying of the website texts ---
 banned_words = [
@@ -36,70 +40,169 @@ banned_words = [
 
 # --- words ---
 
-print("🔮 Harvesting stars and planets...")
+def corpus_files(corpus_dir):
+    return sorted(
+        os.path.join(corpus_dir, name) for name in os.listdir(corpus_dir)
+        if name.endswith(".txt")
+    )
+
+def corpus_fingerprint(files):
+    """
+    Changes when a corpus file is added, removed or edited, or when the model
+    or the banned words change. File sizes + modification times are enough, so
+    checking it doesn't need to read the texts.
+    """
+    try:
+        model_version = importlib.metadata.version(MODEL)
+    except importlib.metadata.PackageNotFoundError:
+        model_version = "unknown"
+
+    digest = hashlib.sha256(f"{MODEL}-{model_version}|{sorted(banned_words)}".encode("utf-8"))
+    for path in files:
+        stat = os.stat(path)
+        digest.update(f"|{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+    return digest.hexdigest()
+
+def read_chunks(files, max_chars=2000):
+    """Streams the corpus as chunks of whole lines (never the whole file in memory)."""
+    for path in files:
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            chunk = []
+            size = 0
+            for line in f:
+                chunk.append(line)
+                size += len(line)
+                if size >= max_chars:
+                    yield "".join(chunk)
+                    chunk = []
+                    size = 0
+            if chunk:
+                yield "".join(chunk)
+
+def harvest(files, processes=1):
+    """ONE pass over all tokens, filling the three word buckets at the same time."""
+    import spacy  # only needed when the cache is outdated
+
+    print("🔮 Gazing into the void (Loading spaCy)...")
+    # parser & ner are not needed for part-of-speech tags and lemmas
+    nlp = spacy.load(MODEL, exclude=["parser", "ner"])
 
-adjectives = list(set([token.text.lower() for token in doc 
-                       if token.pos_ == "ADJ" 
-                       and token.is_alpha 
-                       and token.text.lower() not in banned_words]))
+    print("🔮 Harvesting stars and planets...")
+    banned = set(banned_words)
+    adjectives, nouns, verbs = set(), set(), set()
 
-nouns = list(set([token.text.lower() for token in doc 
-                  if token.pos_ == "NOUN" 
-                  and token.is_alpha 
-                  and token.text.lower() not in banned_words]))
+    for doc in nlp.pipe(read_chunks(files), n_process=processes, batch_size=32):
+        for token in doc:
+            if not token.is_alpha:
+                continue
+            word = token.text.lower()
+            if word in banned:
+                continue
+            if token.pos_ == "ADJ":
+                adjectives.add(word)
+            elif token.pos_ == "NOUN":
+                nouns.add(word)
+            elif token.pos_ == "VERB":
+                verbs.add(token.lemma_.lower())
 
-verbs = list(set([token.lemma_.lower() for token in doc 
-                  if token.pos_ == "VERB" 
-                  and token.is_alpha 
-                  and token.text.lower() not in banned_words]))
+    return {"adj": sorted(adjectives), "noun": sorted(nouns), "verb": sorted(verbs)}
+
+def load_vocabulary(corpus_dir=CORPUS_DIR, processes=1, rebuild=False):
+    """The harvested words, from the cache file if the corpus did not change."""
+    files = corpus_files(corpus_dir)
+    if not files:
+        sys.exit(f"No .txt files found in {corpus_dir}")
+
+    cache_path = os.path.join(corpus_dir, CACHE_NAME)
+    key = corpus_fingerprint(files)
+
+    if not rebuild:
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("key") == key:
+                print("🔮 The stars remember this corpus (using cached words)...")
+                return cached["words"]
+        except (OSError, ValueError):
+            pass
+
+    words = harvest(files, processes)
+    try:
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "files": [os.path.basename(p) for p in files], "words": words}, f)
+    except OSError as e:
+        print(f"(could not save the word cache: {e})")
+    return words
 
 # --- grammar ---
-rules = {
-    "origin": [
-        "#prediction# #advice#",
-        "#observation# #warning#",
-        "#prediction# But #warning#",
-        "The stars align: #prediction#"
-    ],
-    "prediction": [
-        "The stars say you will #verb# a #adj# #noun#.",
-        "Expect #adj.a# #noun# in your #noun#.",
-        "A #adj# #noun# enters your #noun# zone.",
-        "This cycle illuminates your #adj# #noun#."
-    ],
-    "observation": [
-        "Your inner #noun# is feeling #adj# today.",
-        "Mercury is in #noun#, so you might feel #adj#.",
-        "The #noun# is in retrograde."
-    ],
-    "warning": [
-        "Avoid #noun.s# at all costs.",
-        "Do not #verb# with #adj# #noun.s#.",
-        "Beware of the #adj# #noun#.",
-        "Proceed with #noun#."
-    ],
-    "advice": [
-        "Trust your #noun#.",
-        "It is time to #verb# the #noun#.",
-        "Focus on #adj# #noun.s#."
-    ],
-    "adj": adjectives,
-    "noun": nouns,
-    "verb": verbs
-}
-
-grammar = tracery.Grammar(rules)
-grammar.add_modifiers(base_english)
-
-# --- a little show before starting horoscope ---
-type_writer("✨  CONNECTING TO THE COSMOS... FEELING THE COSMIC ENERGY  ✨", speed=0.05)
-print("")
-
-# output structure so there is not two "predictions" etc. makes duplication of sentence structure impossible
-rules_outputs = ["origin", "prediction", "observation", "warning", "advice"]
-
-for rule_name in rules_outputs:
-    generated_text = grammar.flatten(f"#{rule_name}#")
-    type_writer(f"🔮 {generated_text}")
-    time.sleep(0.5) 
-    print("")
\ No newline at end of file
+def make_rules(words):
+    return {
+        "origin": [
+            "#prediction# #advice#",
+            "#observation# #warning#",
+            "#prediction# But #warning#",
+            "The stars align: #prediction#"
+        ],
+        "prediction": [
+            "The stars say you will #verb# a #adj# #noun#.",
+            "Expect #adj.a# #noun# in your #noun#.",
+            "A #adj# #noun# enters your #noun# zone.",
+            "This cycle illuminates your #adj# #noun#."
+        ],
+        "observation": [
+            "Your inner #noun# is feeling #adj# today.",
+            "Mercury is in #noun#, so you might feel #adj#.",
+            "The #noun# is in retrograde."
+        ],
+        "warning": [
+            "Avoid #noun.s# at all costs.",
+            "Do not #verb# with #adj# #noun.s#.",
+            "Beware of the #adj# #noun#.",
+            "Proceed with #noun#."
+        ],
+        "advice": [
+            "Trust your #noun#.",
+            "It is time to #verb# the #noun#.",
+            "Focus on #adj# #noun.s#."
+        ],
+        "adj": words["adj"],
+        "noun": words["noun"],
+        "verb": words["verb"]
+    }
+
+def build_grammar(words):
+    grammar = tracery.Grammar(make_rules(words))
+    grammar.add_modifiers(base_english)
+    return grammar
+
+def main():
+    parser = argparse.ArgumentParser(description="Horoscope generator")
+    parser.add_argument("--corpus", default=CORPUS_DIR, help="folder with the .txt corpus files")
+    parser.add_argument("--processes", type=int, default=1, help="spaCy worker processes for harvesting")
+    parser.add_argument("--rebuild", action="store_true", help="ignore the cached words")
+    add_bulk_arguments(parser)
+    args = parser.parse_args()
+
+    words = load_vocabulary(args.corpus, args.processes, args.rebuild)
+    if args.bulk or args.benchmark:
+        run_bulk(make_rules(words), args)
+        return
+
+    grammar = build_grammar(words)
+
+    # --- a little show before starting horoscope ---
+    type_writer("✨  CONNECTING TO THE COSMOS... FEELING THE COSMIC ENERGY  ✨", speed=0.05)
+    print("")
+
+    # output structure so there is not two "predictions" etc. makes duplication of sentence structure impossible
+    rules_outputs = ["origin", "prediction", "observation", "warning", "advice"]
+
+    for rule_name in rules_outputs:
+        generated_text = grammar.flatten(f"#{rule_name}#")
+        type_writer(f"🔮 {generated_text}")
+        time.sleep(0.5) 
+        print("")
+
+# the guard is needed for --processes > 1 (the worker processes import this file)
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,10 @@
+import argparse
 import spacy
 import sys
 import time
 
+import numpy as np
+
 # --- added a typing effect, because it looks better ---
 def type_writer(text, speed=0.04):
     """
@@ -22,43 +25,119 @@ except OSError:
     print("Error: Model not found. Run 'python -m spacy download en_core_web_lg'")
     exit()
 
+# --- batch engine: every text goes through spaCy ONCE, the comparing is one matrix product ---
+def embed(texts, batch_size=1000):
+    """
+    Returns (matrix of unit vectors, has_vector flags) for a list of texts.
+    Only the tokenizer is needed for word vectors, so all pipeline components are switched off.
+    """
+    vectors = np.zeros((len(texts), nlp.vocab.vectors_length), dtype="float32")
+    known = np.zeros(len(texts), dtype=bool)
+
+    with nlp.select_pipes(disable=nlp.pipe_names):
+        for i, doc in enumerate(nlp.pipe(texts, batch_size=batch_size)):
+            if doc.has_vector and doc.vector_norm:
+                vectors[i] = doc.vector / doc.vector_norm
+                known[i] = True
+    return vectors, known
+
+def sort_chunk(items, category_vectors, categories):
+    """
+    Best category for every item of one chunk (None if the model doesn't know the item).
+    Same result as comparing each item with each category, but all at once.
+    """
+    unique = list(dict.fromkeys(items))  # inventories repeat a lot: embed each text once
+    vectors, known = embed(unique)
+    best = (vectors @ category_vectors.T).argmax(axis=1)  # first best wins, like the old loop
+
+    winner = {}
+    for text, cat_id, ok in zip(unique, best, known):
+        winner[text] = categories[cat_id] if ok else None
+    return [(item, winner[item]) for item in items]
+
+def organize_stream(items, categories, chunk_size=10000):
+    """
+    Sorts a (possibly huge) stream of items, chunk by chunk, so memory stays flat.
+    Yields lists of (item, category) pairs.
+    """
+    if not categories:
+        raise ValueError("I need at least one category.")  # embed([]) has nothing to compare with
+    category_vectors, _ = embed(categories)
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield sort_chunk(chunk, category_vectors, categories)
+            chunk = []
+    if chunk:
+        yield sort_chunk(chunk, category_vectors, categories)
+
 def organize_items(items, categories):
     # --- creating empty buckets for the sorting ---
     buckets = {cat: [] for cat in categories}
     
     type_writer("\n🤔 Thinking hard...", speed=0.05)
     
-    for item_text in items:
-        item_doc = nlp(item_text)
-        
-        # --- skipping words the model doesn't know, otherwise it crashes/gives 0 score ---
-        if not item_doc.has_vector:
-            print(f"[?] I don't know what '{item_text}' is. Skipping.")
-            continue
+    for chunk in organize_stream(items, categories):
+        for item_text, best_category in chunk:
+            # --- skipping words the model doesn't know, otherwise it gives 0 score ---
+            if best_category is None:
+                print(f"[?] I don't know what '{item_text}' is. Skipping.")
+                continue
 
-        best_score = -1
-        best_category = None
-        
-        # --- comparing the item to every category ---
-        for cat in categories:
-            cat_doc = nlp(cat)
-            
-            # calculating similarity
-            score = item_doc.similarity(cat_doc)
-            
-            if score > best_score:
-                best_score = score
-                best_category = cat
-        
-        # --- putting the item in the winner bucket ---
-        if best_category:
+            # --- putting the item in the winner bucket ---
             buckets[best_category].append(item_text)
-            sys.stdout.write(".") # visual progress dot
-            sys.stdout.flush()
+        sys.stdout.write(".") # visual progress dot (one per chunk)
+        sys.stdout.flush()
 
     print("") # clear the line after dots
     return buckets
 
+def split_categories(text):
+    """'fruit, tools,,' -> ['fruit', 'tools']"""
+    return [c.strip() for c in text.split(",") if c.strip()]
+
+def read_items(path):
+    """One item per line, read lazily ('-' = standard input)."""
+    source = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for line in source:
+            line = line.strip()
+            if line:
+                yield line
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+def sort_file(args):
+    """Batch mode: sorts a whole inventory file and writes 'item<TAB>category' lines chunk by chunk."""
+    categories = split_categories(args.categories)
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    counts = {cat: 0 for cat in categories}
+    skipped = 0
+    total = 0
+    start = time.perf_counter()
+
+    for chunk in organize_stream(read_items(args.items), categories, args.chunk_size):
+        lines = []
+        for item, category in chunk:
+            if category is None:
+                skipped += 1
+                continue
+            counts[category] += 1
+            lines.append(f"{item}\t{category}\n")
+        out.write("".join(lines))
+        total += len(chunk)
+        print(f"... {total} items sorted", file=sys.stderr)
+
+    if out is not sys.stdout:
+        out.close()
+
+    seconds = time.perf_counter() - start
+    print(f"\n📦 {total} items in {seconds:.1f}s ({total / max(seconds, 1e-9):.0f} items/sec), {skipped} unknown", file=sys.stderr)
+    for category, n in counts.items():
+        print(f"📁 {category}: {n}", file=sys.stderr)
+
 def main():
     # --- a little show before starting ---
     print("")
@@ -80,7 +159,7 @@ def main():
 
         print("Step 2: The Categories (Comma separated)")
         raw_cats = input(">> Categories: ")
-        categories = [c.strip() for c in raw_cats.split(",") if c.strip()]
+        categories = split_categories(raw_cats)
 
         if not categories:
             print("I need at least one category.")
@@ -106,7 +185,19 @@ def main():
         print("\n")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Smart List Organizer (interactive without arguments)")
+    parser.add_argument("--items", help="file with one item per line ('-' for standard input)")
+    parser.add_argument("--categories", help="comma separated categories")
+    parser.add_argument("--output", help="where to write 'item<TAB>category' lines (default: screen)")
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    if args.items:
+        if not args.categories or not split_categories(args.categories):
+            parser.error("--categories needs at least one category, e.g. --categories \"fruit,tools\"")
+        sort_file(args)
+    else:
+        main()
 
 
 
@@ -0,0 +1,195 @@
+# Bulk text generation for the tracery grammars of Assignment 1 and 2
+
+import random
+import re
+import sys
+import time
+
+import tracery
+from tracery.modifiers import base_english
+
+# --- compiling: the rule dict becomes an expansion plan ONCE ---
+# tracery parses every rule text again for every single sentence (and builds a tree of Node
+# objects). Here each rule is parsed one time into a list of steps:
+#   "plain text"                      -> copied as it is
+#   (symbol, [modifier functions])    -> expanded + modified
+# Generating a sentence is then only random picks and string joins.
+
+def compile_grammar(rules, modifiers=base_english):
+    """Returns the expansion plan: symbol -> list of alternatives (each a list of steps)."""
+    plan = {}
+    for symbol, raw in rules.items():
+        alternatives = raw if isinstance(raw, list) else [raw]
+        plan[symbol] = [compile_rule(rule, modifiers) for rule in alternatives]
+    return plan
+
+def compile_rule(rule, modifiers):
+    sections, errors = tracery.parse(rule)
+    if errors:
+        raise ValueError(f"Can't parse rule '{rule}': {errors}")
+
+    steps = []
+    for section in sections:
+        if section["type"] == 0:
+            text = unescape(section["raw"])
+            if steps and isinstance(steps[-1], str):
+                steps[-1] += text  # glue neighbouring plain text together
+            else:
+                steps.append(text)
+        elif section["type"] == 1:
+            tag = tracery.parse_tag(section["raw"])
+            if tag["preactions"]:
+                raise ValueError(f"Actions like '[...]' are not supported in bulk mode: '{rule}'")
+            steps.append((tag["symbol"], [compile_modifier(name, modifiers) for name in tag["modifiers"]]))
+        else:
+            raise ValueError(f"Actions like '[...]' are not supported in bulk mode: '{rule}'")
+    return steps
+
+def unescape(text):
+    """Removes escape backslashes like tracery does at the end of flatten()."""
+    return text.replace("\\\\", "\0").replace("\\", "").replace("\0", "\\")
+
+def compile_modifier(name, modifiers):
+    """'s' -> the function, 'replace(a,b)' -> the function with its parameters."""
+    params = []
+    if name.find("(") > 0:
+        matches = re.findall(r"\(([^)]+)\)", name)
+        if matches:
+            params = matches[0].split(",")
+        name = name[:name.find("(")]
+
+    function = modifiers.get(name)
+    if function is None:
+        return lambda text: text + "((." + name + "))"  # same marker as tracery
+    if params:
+        return lambda text: function(text, *params)
+    return function
+
+# --- generating ---
+
+def make_expander(plan, rng):
+    """Builds expand(symbol) for one plan and one random generator."""
+    pick = rng.random
+
+    def expand(symbol):
+        alternatives = plan.get(symbol)
+        if not alternatives:
+            return "((" + str(symbol) + "))"
+        steps = alternatives[int(pick() * len(alternatives))]
+        parts = []
+        for step in steps:
+            if step.__class__ is str:
+                parts.append(step)
+            else:
+                text = expand(step[0])
+                for modifier in step[1]:
+                    text = modifier(text)
+                parts.append(text)
+        return "".join(parts)
+
+    return expand
+
+def count_sentences(plan, symbol="origin", seen=()):
+    """How many different sentences the plan can make (inf for recursive grammars)."""
+    if symbol in seen:
+        return float("inf")
+    total = 0
+    for steps in plan.get(symbol, [[]]):
+        n = 1
+        for step in steps:
+            if not isinstance(step, str):
+                n *= count_sentences(plan, step[0], seen + (symbol,))
+        total += n
+    return total
+
+def generate(plan, count, symbol="origin", seed=None, unique=False):
+    """
+    Yields 'count' sentences. Same seed -> same sentences.
+    With unique=True no sentence is repeated; it stops early when the
+    grammar can't make enough different ones.
+    """
+    expand = make_expander(plan, random.Random(seed))
+    if not unique:
+        for _ in range(count):
+            yield expand(symbol)
+        return
+
+    count = min(count, count_sentences(plan, symbol))
+    # the last few new sentences are rare (like collecting the last stickers of an album),
+    # so only give up after many duplicates in a row
+    patience = max(10000, 10 * min(count, 10 ** 6))
+    seen = set()
+    misses = 0
+    while len(seen) < count and misses < patience:
+        sentence = expand(symbol)
+        if sentence in seen:
+            misses += 1
+            continue
+        misses = 0
+        seen.add(sentence)
+        yield sentence
+
+def write_sentences(sentences, path, chunk_lines=10000):
+    """Streams sentences to a file ('-' = screen), a chunk of lines at a time. Returns how many were written."""
+    out = sys.stdout if path == "-" else open(path, "w", encoding="utf-8")
+    written = 0
+    chunk = []
+    try:
+        for sentence in sentences:
+            chunk.append(sentence)
+            if len(chunk) >= chunk_lines:
+                out.write("\n".join(chunk) + "\n")
+                written += len(chunk)
+                chunk = []
+        if chunk:
+            out.write("\n".join(chunk) + "\n")
+            written += len(chunk)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return written
+
+# --- comparing with plain tracery ---
+
+def benchmark(rules, symbol="origin", n=20000):
+    """Sentences per second: grammar.flatten() one at a time vs the compiled plan."""
+    grammar = tracery.Grammar(rules)
+    grammar.add_modifiers(base_english)
+    start = time.perf_counter()
+    for _ in range(n):
+        grammar.flatten(f"#{symbol}#")
+    tracery_rate = n / (time.perf_counter() - start)
+
+    plan = compile_grammar(rules)
+    start = time.perf_counter()
+    for _ in generate(plan, n, symbol):
+        pass
+    bulk_rate = n / (time.perf_counter() - start)
+
+    print(f"tracery flatten: {tracery_rate:12,.0f} sentences/sec")
+    print(f"bulk engine:     {bulk_rate:12,.0f} sentences/sec ({bulk_rate / tracery_rate:.1f}x)")
+    return tracery_rate, bulk_rate
+
+def run_bulk(rules, args, symbol="origin"):
+    """Shared by the --bulk / --benchmark flags of Assignment 1 and 2."""
+    if args.benchmark:
+        benchmark(rules, symbol)
+        return
+
+    plan = compile_grammar(rules)
+    if args.unique:
+        possible = count_sentences(plan, symbol)
+        if possible < args.bulk:
+            print(f"(the grammar can only make {possible:,} different sentences)", file=sys.stderr)
+
+    start = time.perf_counter()
+    written = write_sentences(generate(plan, args.bulk, symbol, args.seed, args.unique), args.out)
+    seconds = time.perf_counter() - start
+    print(f"✨ {written:,} sentences in {seconds:.1f}s ({written / max(seconds, 1e-9):,.0f}/sec) -> {args.out}", file=sys.stderr)
+
+def add_bulk_arguments(parser):
+    parser.add_argument("--bulk", type=int, help="generate this many sentences at once (no typing effect)")
+    parser.add_argument("--out", default="-", help="file for --bulk output (default: screen)")
+    parser.add_argument("--seed", type=int, help="same seed -> same sentences")
+    parser.add_argument("--unique", action="store_true", help="no repeated sentences")
+    parser.add_argument("--benchmark", action="store_true", help="compare the speed with tracery's flatten()")
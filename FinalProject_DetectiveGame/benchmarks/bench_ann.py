@@ -0,0 +1,98 @@
+"""
+Recall vs latency of the approximate (LSH) story search against the exact scan.
+
+Builds big synthetic stories (clustered random vectors, like sentences about
+the same few topics) and asks questions that are noisy copies of a sentence.
+Recall = how often the ANN search picks the same sentence as the exact scan.
+No spaCy model is needed.
+
+Run from the project folder:
+    python benchmarks/bench_ann.py [sentences ...]
+"""
+import random
+import sys
+import time
+
+import numpy as np
+
+from common import write_results
+
+from src.lemma_index import LemmaIndex
+from src.story_index import StoryIndex
+
+DIMS = 300
+TOPICS = 200
+QUERIES = 300
+VOCAB = [f"word{i}" for i in range(5000)]
+CONFIGS = [(4, 8), (8, 10), (8, 12), (16, 12)]  # (tables, bits per table)
+
+
+def unit_rows(matrix):
+    return (matrix / np.linalg.norm(matrix, axis=1, keepdims=True)).astype("float32")
+
+
+def make_index(n_sentences, rng):
+    topics = rng.standard_normal((TOPICS, DIMS))
+    vectors = unit_rows(topics[rng.integers(0, TOPICS, n_sentences)] + 0.8 * rng.standard_normal((n_sentences, DIMS)))
+    lemmas = [set(random.sample(VOCAB, 8)) for _ in range(n_sentences)]
+    index = StoryIndex([f"Sentence {i}." for i in range(n_sentences)], lemmas, vectors)
+    LemmaIndex([index], synonyms={})
+    return index
+
+
+def make_queries(index, rng):
+    picks = rng.integers(0, len(index), QUERIES)
+    vectors = unit_rows(index.vectors[picks] + 0.6 / np.sqrt(DIMS) * rng.standard_normal((QUERIES, DIMS)))
+    # a third of the questions also share a word with some sentence
+    lemmas = [random.sample(VOCAB, 2) if i % 3 == 0 else [] for i in range(QUERIES)]
+    return list(zip(vectors, lemmas))
+
+
+def run(index, queries):
+    """Returns (picks, ms per question, avg. candidates)."""
+    picks = []
+    candidates = 0
+    start = time.perf_counter()
+    for q_vector, q_lemmas in queries:
+        picks.append(int(index.scores(q_vector, q_lemmas).argmax()))
+    ms = (time.perf_counter() - start) * 1000 / len(queries)
+    if index.ann is not None:
+        candidates = sum(len(index.ann.candidates(q)) for q, _ in queries) / len(queries)
+    return picks, ms, candidates
+
+
+def main():
+    sizes = [int(n) for n in sys.argv[1:]] or [2000, 10000, 50000]
+    rng = np.random.default_rng(0)
+    random.seed(0)
+    results = []
+
+    print(f"{'sentences':>9} {'index':>13} {'recall@1':>9} {'ms/query':>9} {'speedup':>8} {'candidates':>11} {'build s':>8}")
+    for n in sizes:
+        index = make_index(n, rng)
+        queries = make_queries(index, rng)
+
+        index.ann = None
+        exact, exact_ms, _ = run(index, queries)
+        print(f"{n:>9} {'exact scan':>13} {1.0:>9.3f} {exact_ms:>9.3f} {1.0:>7.1f}x {n:>11}")
+        results.append({"sentences": n, "index": "exact", "recall": 1.0, "ms_per_query": round(exact_ms, 4)})
+
+        for tables, bits in CONFIGS:
+            start = time.perf_counter()
+            index.build_ann(n_tables=tables, n_bits=bits)
+            build_s = time.perf_counter() - start
+            picks, ms, candidates = run(index, queries)
+            recall = sum(a == b for a, b in zip(picks, exact)) / len(exact)
+            name = f"lsh {tables}x{bits}"
+            print(f"{n:>9} {name:>13} {recall:>9.3f} {ms:>9.3f} {exact_ms / ms:>7.1f}x {candidates:>11.0f} {build_s:>8.2f}")
+            results.append({
+                "sentences": n, "index": name, "recall": round(recall, 4), "ms_per_query": round(ms, 4),
+                "avg_candidates": round(candidates, 1), "build_s": round(build_s, 3),
+            })
+
+    path = write_results("ann", {"dims": DIMS, "queries": QUERIES, "runs": results})
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Throughput of the micro-batching scheduler against one brain.parse call per
+question, with many simulated players asking at the same time.
+
+Run from the project folder:
+    python benchmarks/bench_batching.py [players] [questions_per_player]
+"""
+import asyncio
+import copy
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import all_questions
+
+from src.batching import BatchScheduler
+from src.nlp import DetectiveBrain
+from src.suspect_data import load_scenario
+
+QUESTIONS = all_questions()
+
+
+async def play(ask, suspects, n_questions, rng):
+    suspects = [copy.copy(s) for s in suspects]
+    for _ in range(n_questions):
+        await ask(rng.choice(QUESTIONS), rng.choice(suspects))
+
+
+async def run(ask, suspects, players, n_questions):
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        play(ask, suspects, n_questions, random.Random(i)) for i in range(players)
+    ])
+    return players * n_questions / (time.perf_counter() - start)
+
+
+def main():
+    players = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    n_questions = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    brain = DetectiveBrain(cache_size=0)
+    scenario = load_scenario("data/scenario_generated.json")
+    brain.compile_scenario(scenario["suspects"], source=scenario["path"])
+    suspects = scenario["suspects"]
+    executor = ThreadPoolExecutor(max_workers=1)
+
+    async def unbatched(msg, suspect):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, brain.parse, msg, suspect)
+
+    qps = asyncio.run(run(unbatched, suspects, players, n_questions))
+    print(f"unbatched:                      {qps:8.1f} questions/sec")
+
+    for max_batch, max_latency in [(8, 0.002), (16, 0.005), (64, 0.010)]:
+        scheduler = BatchScheduler(brain, executor, max_batch, max_latency)
+        qps = asyncio.run(run(scheduler.parse, suspects, players, n_questions))
+        print(f"batched (max {max_batch:2d}, {max_latency * 1000:4.1f} ms): {qps:8.1f} questions/sec "
+              f"(avg batch {scheduler.stats()['avg_batch_size']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Time-to-first-content of streamed scenario generation.
+
+Replays a finished scenario through a fake stream at the speed of the API
+(default 400 characters/sec, roughly 100 tokens/sec) and reports when the
+title, the intro and each suspect become visible, compared with waiting for
+the whole response like the non-streaming call does. No API key needed.
+
+Run from the project folder:
+    python benchmarks/bench_generation.py [chars_per_sec] [chunk_size]
+"""
+import json
+import sys
+import time
+
+from common import PROJECT_DIR, write_results
+
+from src.json_stream import MYSTERY_PREVIEW, fake_stream, parse_stream
+
+
+def main():
+    chars_per_sec = float(sys.argv[1]) if len(sys.argv) > 1 else 400.0
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+
+    with open(f"{PROJECT_DIR}/data/scenario_generated.json", encoding="utf-8") as f:
+        text = json.dumps(json.load(f), indent=2)
+
+    seen = []
+    start = time.perf_counter()
+    chunks = fake_stream(text, chunk_size, delay=chunk_size / chars_per_sec)
+    _, stats = parse_stream(chunks, MYSTERY_PREVIEW, lambda path, value: seen.append((path, time.perf_counter() - start)), start)
+
+    results = {
+        "chars": len(text),
+        "chars_per_sec": chars_per_sec,
+        "chunk_size": chunk_size,
+        "first_content_s": round(stats["first_content_s"], 3),
+        "total_s": round(stats["total_s"], 3),
+        "events": [{"path": "/".join(str(p) for p in path), "at_s": round(at, 3)} for path, at in seen],
+    }
+
+    print(f"{'visible':<22} {'after s':>8}")
+    for event in results["events"]:
+        print(f"{event['path']:<22} {event['at_s']:>8.2f}")
+    print(f"\nTime to first content: {results['first_content_s']:.2f} s (streamed)")
+    print(f"Time to first content: {results['total_s']:.2f} s (waiting for the full response)")
+
+    path = write_results("generation", results)
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Latency & throughput benchmark for the interrogation hot path
+(DetectiveBrain.parse -> time / greeting / accusation / story).
+
+Replays the question corpus (benchmarks/questions.json) against every suspect
+of a scenario and reports p50/p95/p99 latency, questions/sec, peak RSS and
+model load time. Results are written to benchmarks/results/ as JSON.
+
+Run from the project folder:
+    python benchmarks/bench_hotpath.py
+    python benchmarks/bench_hotpath.py --compare benchmarks/results/hotpath-<old>.json
+"""
+import argparse
+import json
+import random
+import time
+
+from common import latency_summary, load_questions, peak_rss_mb, write_results
+
+from src.nlp import DEFAULT_PROFILE, PIPELINE_PROFILES, DetectiveBrain
+from src.suspect_data import load_scenario
+
+
+def replay(brain, suspects, corpus, rounds):
+    """Asks every question to every suspect 'rounds' times. Returns latencies per category."""
+    latencies = {category: [] for category in corpus}
+    random.seed(0)
+    for _ in range(rounds):
+        for suspect in suspects:
+            # fresh mood every round, like a new game
+            suspect.willingness = 100
+            suspect.last_match = None
+            for category, questions in corpus.items():
+                for question in questions:
+                    start = time.perf_counter()
+                    brain.parse(question, suspect)
+                    latencies[category].append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def compare(current, previous_path):
+    with open(previous_path, encoding="utf-8") as f:
+        previous = json.load(f)
+
+    print(f"\nCompared with {previous_path}:")
+    for key in ("p50_ms", "p95_ms", "p99_ms"):
+        old, new = previous["overall"][key], current["overall"][key]
+        change = (new - old) / old * 100 if old else 0.0
+        print(f"  {key:<7} {old:8.3f} -> {new:8.3f} ({change:+.1f}%)")
+    old, new = previous["questions_per_sec"], current["questions_per_sec"]
+    print(f"  q/sec   {old:8.1f} -> {new:8.1f} ({(new - old) / old * 100:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", default="data/scenario_generated.json")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE, choices=list(PIPELINE_PROFILES))
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    parser.add_argument("--stages", action="store_true", help="also record per-stage timings (brain.metrics)")
+    parser.add_argument("--cache", action="store_true", help="switch the answer cache on (off: every question is parsed)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    brain = DetectiveBrain(profile=args.profile, cache_size=2048 if args.cache else 0)
+    load_s = time.perf_counter() - start
+
+    scenario = load_scenario(args.scenario)
+    start = time.perf_counter()
+    brain.compile_scenario(scenario["suspects"], source=scenario["path"])
+    compile_s = time.perf_counter() - start
+
+    brain.metrics.enabled = args.stages
+    corpus = load_questions()
+    start = time.perf_counter()
+    latencies = replay(brain, scenario["suspects"], corpus, args.rounds)
+    total_s = time.perf_counter() - start
+
+    every = [ms for values in latencies.values() for ms in values]
+    results = {
+        "scenario": args.scenario,
+        "profile": args.profile,
+        "rounds": args.rounds,
+        "answer_cache": brain.cache.stats() if brain.cache else None,
+        "model_load_s": round(load_s, 3),
+        "scenario_compile_s": round(compile_s, 3),
+        "questions_per_sec": round(len(every) / total_s, 1),
+        "peak_rss_mb": peak_rss_mb(),
+        "overall": latency_summary(every),
+        "by_category": {category: latency_summary(values) for category, values in latencies.items()},
+    }
+    if args.stages:
+        results["stages"] = brain.metrics.to_dict()
+
+    print(f"Model load:       {results['model_load_s']:.2f} s")
+    print(f"Scenario compile: {results['scenario_compile_s']:.3f} s")
+    print(f"Throughput:       {results['questions_per_sec']:.1f} questions/sec")
+    print(f"Peak RSS:         {results['peak_rss_mb']} MB")
+    if brain.cache:
+        print(f"Cache hit rate:   {results['answer_cache']['hit_rate']:.1%}")
+    print(f"\n{'category':<12} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for category, s in list(results["by_category"].items()) + [("overall", results["overall"])]:
+        print(f"{category:<12} {s['count']:>6} {s['p50_ms']:>9.3f} {s['p95_ms']:>9.3f} {s['p99_ms']:>9.3f}")
+
+    if args.stages:
+        print(f"\n{'stage':<12} {'calls':>6} {'avg ms':>9}")
+        for stage, h in results["stages"]["stages"].items():
+            print(f"{stage:<12} {h['count']:>6} {h['avg_ms']:>9.4f}")
+        print(f"answered by: {results['stages']['branches']}")
+
+    path = write_results("hotpath", results)
+    print(f"\nResults written to {path}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Startup benchmark: how long until the main menu shows up, and which imports
+cost the time (python -X importtime).
+
+spaCy and google.genai must NOT be imported before the menu: the brain is only
+loaded when a case starts, the Gemini client only when a mystery is generated.
+
+Run from the project folder:
+    python benchmarks/bench_import.py [runs]
+
+Exits with status 1 if the time-to-menu is above TARGET_MENU_S or a heavy
+module was imported at startup, so it can be used as a check.
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import PROJECT_DIR, write_results
+
+TARGET_MENU_S = 0.5
+HEAVY_MODULES = ("spacy", "thinc", "google.genai", "numpy")
+
+
+def import_profile():
+    """[(cumulative us, self us, depth, module)] for every module that "import main" loads."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=PROJECT_DIR, stdin=subprocess.DEVNULL, capture_output=True, text=True
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2  # importtime indents nested imports by 2
+        modules.append((int(cumulative), int(own), depth, name.strip()))
+    return modules
+
+
+def time_to_menu(runs):
+    """Fastest wall time of 'python main.py' -> menu -> Exit, in a temporary copy of data/."""
+    times = []
+    with tempfile.TemporaryDirectory() as workdir:
+        os.makedirs(os.path.join(workdir, "data"))
+        save = os.path.join(PROJECT_DIR, "data", "scenario_generated.json")
+        if os.path.exists(save):
+            shutil.copy(save, os.path.join(workdir, "data"))
+        env = dict(os.environ, TERM=os.environ.get("TERM", "dumb"))
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(
+                [sys.executable, os.path.join(PROJECT_DIR, "main.py")], cwd=workdir, env=env,
+                input="3\n", capture_output=True, text=True, check=True
+            )
+            times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    modules = import_profile()
+    total_s = next((c for c, _, _, name in modules if name == "main"), 0) / 1e6
+    # importtime lists children before their parent: main.py's own imports are the depth-1 lines before "main"
+    last_root = max((i for i, m in enumerate(modules) if m[2] == 0 and m[3] != "main"), default=-1)
+    top_level = sorted((m for m in modules[last_root + 1:] if m[2] == 1), reverse=True)
+    loaded = {name for _, _, _, name in modules}
+    heavy = [m for m in HEAVY_MODULES if m in loaded]
+
+    menu_s = time_to_menu(runs)
+
+    print(f"import main: {total_s * 1000:.0f} ms")
+    for cumulative, _, _, name in top_level[:8]:
+        print(f"   {cumulative / 1000:8.1f} ms  {name}")
+    print(f"time to menu (best of {runs}): {menu_s * 1000:.0f} ms (target {TARGET_MENU_S * 1000:.0f} ms)")
+    if heavy:
+        print(f"❌ heavy modules imported at startup: {', '.join(heavy)}")
+
+    path = write_results("import", {
+        "import_main_ms": round(total_s * 1000, 1),
+        "time_to_menu_ms": round(menu_s * 1000, 1),
+        "target_ms": TARGET_MENU_S * 1000,
+        "heavy_modules": heavy,
+        "top_imports": [{"module": name, "ms": round(c / 1000, 1)} for c, _, _, name in top_level[:15]],
+    })
+    print(f"Results saved to {path}")
+
+    ok = menu_s <= TARGET_MENU_S and not heavy
+    print("✅ within target" if ok else "❌ over target")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Compares the spaCy pipeline profiles of DetectiveBrain ("full" vs "fast"):
+cold start time, CPU time per question and whether the answers are identical.
+
+Every profile runs in its own fresh Python process, so the cold start is real.
+Exits with status 1 if any answer differs from "full".
+
+Run from the project folder:
+    python benchmarks/bench_profiles.py
+"""
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+from common import PROJECT_DIR, all_questions
+
+QUESTIONS = all_questions()
+ROUNDS = 10
+
+
+def run_profile(profile):
+    """Child process: loads one profile and measures it. Prints JSON."""
+    start = time.perf_counter()
+    from src.nlp import DetectiveBrain
+    from src.suspect_data import load_scenario
+    brain = DetectiveBrain(profile=profile, cache_size=0)  # every answer really comes from this profile
+    scenario = load_scenario("data/scenario_generated.json")
+    brain.compile_scenario(scenario["suspects"])
+    startup_s = time.perf_counter() - start
+
+    answers = []
+    calls = 0
+    cpu_start = time.process_time()
+    for _ in range(ROUNDS):
+        random.seed(0)
+        answers = []
+        for suspect in scenario["suspects"]:
+            suspect.last_match = None
+            suspect.willingness = 100
+            for question in QUESTIONS:
+                answers.append(brain.parse(question, suspect))
+                calls += 1
+    cpu_ms = (time.process_time() - cpu_start) * 1000 / calls
+
+    print(json.dumps({"profile": profile, "startup_s": startup_s, "cpu_ms": cpu_ms, "answers": answers}))
+
+
+def main():
+    from src.nlp import PIPELINE_PROFILES
+
+    results = {}
+    for profile in PIPELINE_PROFILES:
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", profile],
+            cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+        ).stdout
+        results[profile] = json.loads(out.strip().splitlines()[-1])
+
+    print(f"{'profile':<8} {'cold start':>12} {'cpu/question':>14}")
+    for profile, r in results.items():
+        print(f"{profile:<8} {r['startup_s']:>10.2f} s {r['cpu_ms']:>11.2f} ms")
+
+    reference = results["full"]["answers"]
+    total_diffs = 0
+    for profile, r in results.items():
+        diffs = sum(1 for a, b in zip(reference, r["answers"]) if a != b)
+        total_diffs += diffs
+        print(f"{profile}: {diffs} of {len(reference)} answers differ from 'full'")
+    sys.exit(1 if total_diffs else 0)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--child":
+        run_profile(sys.argv[2])
+    else:
+        main()
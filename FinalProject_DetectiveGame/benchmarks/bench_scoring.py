@@ -0,0 +1,76 @@
+"""
+Scaling check for the vectorized story scoring (StoryIndex.scores)
+against the old one-sentence-at-a-time loop.
+Uses random vectors and lemmas, so no spaCy model is needed.
+
+Run from the project folder:
+    python benchmarks/bench_scoring.py
+"""
+import random
+import time
+
+import numpy as np
+
+import common  # noqa: F401  (puts the project folder on sys.path)
+from src.story_index import StoryIndex
+from src.lemma_index import LemmaIndex
+
+DIMS = 300
+VOCAB = [f"word{i}" for i in range(2000)]
+REPEATS = 200
+
+
+def make_index(n_sentences, rng):
+    vectors = rng.standard_normal((n_sentences, DIMS)).astype("float32")
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    lemmas = [set(random.sample(VOCAB, 12)) for _ in range(n_sentences)]
+    sentences = [f"Sentence {i}." for i in range(n_sentences)]
+    index = StoryIndex(sentences, lemmas, vectors)
+    LemmaIndex([index], synonyms={})
+    return index
+
+
+def loop_scores(index, q_vector, search_terms):
+    """The old check_story loop, for comparison."""
+    best_score, best = 0.0, None
+    for i, s_lemmas in enumerate(index.lemmas):
+        score = float(q_vector.dot(index.vectors[i]))
+        matches = 0
+        for term in search_terms:
+            if term in list(s_lemmas):
+                matches += 1
+        if matches > 0:
+            score += matches * 3.0
+        if score > best_score:
+            best_score, best = score, i
+    return best
+
+
+def main():
+    rng = np.random.default_rng(0)
+    random.seed(0)
+
+    for n in (10, 100, 1000, 5000):
+        index = make_index(n, rng)
+        q_vector = rng.standard_normal(DIMS).astype("float32")
+        q_vector /= np.linalg.norm(q_vector)
+        search_terms = set(random.sample(VOCAB, 15))
+
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            scores = index.scores(q_vector, search_terms)
+            fast_best = int(scores.argmax())
+        fast_ms = (time.perf_counter() - start) * 1000 / REPEATS
+
+        repeats = max(1, REPEATS // max(1, n // 100))
+        start = time.perf_counter()
+        for _ in range(repeats):
+            slow_best = loop_scores(index, q_vector, search_terms)
+        slow_ms = (time.perf_counter() - start) * 1000 / repeats
+
+        same = "same pick" if fast_best == slow_best else "DIFFERENT pick"
+        print(f"{n:5d} sentences: vectorized {fast_ms:7.3f} ms | loop {slow_ms:8.3f} ms | {same}")
+
+
+if __name__ == "__main__":
+    main()
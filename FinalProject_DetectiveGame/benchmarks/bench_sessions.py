@@ -0,0 +1,74 @@
+"""
+Memory per game session: the shared suspect records + a small SuspectState per
+game, against the old way (every player got copies of dict-backed Suspect objects).
+No spaCy needed: only the game state is measured, not the model.
+
+Run from the project folder:
+    python benchmarks/bench_sessions.py [sessions]
+"""
+import copy
+import sys
+import tracemalloc
+
+from common import write_results
+
+from src.game import GameSession
+from src.models import RECORD_FIELDS, new_game
+from src.suspect_data import load_scenario
+
+
+class DictSuspect:
+    """The suspects before: a __dict__ with the scenario data AND the game state, copied per player."""
+
+    def __init__(self, record):
+        for field in RECORD_FIELDS:
+            setattr(self, field, getattr(record, field))
+        self.timeline = dict(record.timeline)
+        self.prefixes = list(record.prefixes)
+        self.suffixes = list(record.suffixes)
+        self.knowledge = DictSuspect.__new__(DictSuspect)  # the unused KnowledgeBase
+        self.knowledge.facts = {}
+        self.last_match = None
+        self.willingness = 100
+        self.story_index = None
+
+
+def measure(make, n):
+    """Bytes that n objects from make() keep alive."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    keep = [make() for _ in range(n)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del keep
+    return total
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    scenario = load_scenario("data/scenario_generated.json")
+    suspects = scenario["suspects"]
+    old_suspects = [DictSuspect(s.record) for s in suspects]
+
+    old_bytes = measure(lambda: [copy.copy(s) for s in old_suspects], n)
+    state_bytes = measure(lambda: new_game(suspects), n)
+    session_bytes = measure(lambda: GameSession(scenario), n)
+
+    print(f"{n} concurrent games, {len(suspects)} suspects each:")
+    print(f"  copied dict suspects (before): {old_bytes / n:8.0f} bytes/game")
+    print(f"  SuspectState + views (now):    {state_bytes / n:8.0f} bytes/game ({old_bytes / max(state_bytes, 1):.1f}x less)")
+    print(f"  whole GameSession (now):       {session_bytes / n:8.0f} bytes/game")
+
+    path = write_results("sessions", {
+        "sessions": n,
+        "suspects": len(suspects),
+        "copied_suspects_bytes_per_game": round(old_bytes / n),
+        "suspect_state_bytes_per_game": round(state_bytes / n),
+        "game_session_bytes_per_game": round(session_bytes / n),
+    })
+    print(f"Results saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Measures the per-question latency of DetectiveBrain.parse with and without
+the precompiled story index.
+
+Run from the project folder:
+    python benchmarks/bench_story_index.py
+"""
+import random
+import time
+
+from common import load_questions
+
+from src.suspect_data import load_scenario
+from src.nlp import DetectiveBrain
+
+QUESTIONS = load_questions()["story"]
+ROUNDS = 20
+
+
+def time_questions(brain, suspects, recompile):
+    """Returns the average milliseconds per parse() call."""
+    calls = 0
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for suspect in suspects:
+            for question in QUESTIONS:
+                if recompile:
+                    # old behaviour: the story was parsed again on every question
+                    suspect.story_index = None
+                suspect.last_match = None
+                brain.parse(question, suspect)
+                calls += 1
+    return (time.perf_counter() - start) * 1000 / calls
+
+
+def main():
+    brain = DetectiveBrain(cache_size=0)
+    scenario = load_scenario("data/scenario_generated.json")
+    suspects = scenario["suspects"]
+
+    random.seed(0)
+    old_ms = time_questions(brain, suspects, recompile=True)
+
+    brain.compile_scenario(suspects)
+    random.seed(0)
+    new_ms = time_questions(brain, suspects, recompile=False)
+
+    print(f"Re-parsing the story each question: {old_ms:.2f} ms/question")
+    print(f"Precompiled story index:            {new_ms:.2f} ms/question")
+    print(f"Speedup: {old_ms / new_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
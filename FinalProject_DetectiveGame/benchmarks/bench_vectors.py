@@ -0,0 +1,117 @@
+"""
+Compares the word-vector modes of DetectiveBrain ("full" vs the compact
+"float16" and "int8" tables): memory of the vector table, process memory,
+CPU time per question and whether best_sentence still picks the same sentences.
+
+The question corpus is part of the compact vocabulary, so a few extra questions
+with other words (HELD_OUT) show what the nearest-neighbour remap does.
+Every mode runs in its own fresh Python process, so the memory numbers are real.
+
+Run from the project folder:
+    python benchmarks/bench_vectors.py
+"""
+import gc
+import json
+import os
+import subprocess
+import sys
+import time
+
+from common import PROJECT_DIR, all_questions, write_results
+
+QUESTIONS = all_questions()
+HELD_OUT = [
+    "Where did you wander after supper?",
+    "Did you quarrel with the victim?",
+    "Who inherits his fortune now?",
+    "Were you near the corridor around midnight?",
+    "What were you holding in your hands?",
+    "Did anybody behave strangely tonight?",
+    "Tell me about the poison vial.",
+    "Why were you so nervous earlier?",
+]
+
+
+def rss_mb():
+    """Current resident memory in MB (Linux only, else None)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return round(int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20, 1)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def run_mode(mode):
+    """Child process: loads the brain with one vector mode and measures it. Prints JSON."""
+    from src.nlp import DetectiveBrain
+    from src.suspect_data import load_scenario
+    from src.vectors import table_nbytes
+
+    brain = DetectiveBrain(vectors=mode, cache_size=0)
+    gc.collect()
+    loaded_mb = rss_mb()
+    full_bytes = table_nbytes(brain.nlp.vocab.vectors)
+
+    scenario = load_scenario("data/scenario_generated.json")
+    start = time.perf_counter()
+    brain.compile_scenario(scenario["suspects"])  # no cache file: the compact table changes the key
+    compile_s = time.perf_counter() - start
+    gc.collect()
+
+    picks = {"corpus": [], "held_out": []}
+    calls = 0
+    cpu_start = time.process_time()
+    for name, questions in (("corpus", QUESTIONS), ("held_out", HELD_OUT)):
+        for suspect in scenario["suspects"]:
+            for question in questions:
+                picks[name].append(brain.best_sentence(brain.nlp(question.lower().strip()), suspect))
+                calls += 1
+    cpu_ms = (time.process_time() - cpu_start) * 1000 / calls
+
+    before, after = brain.vector_bytes or (full_bytes, full_bytes)
+    print(json.dumps({
+        "mode": mode,
+        "table_bytes_before": before,
+        "table_bytes": after,
+        "rss_loaded_mb": loaded_mb,
+        "rss_mb": rss_mb(),
+        "compile_s": round(compile_s, 3),
+        "cpu_ms": round(cpu_ms, 3),
+        "picks": picks,
+    }))
+
+
+def main():
+    from src.vectors import VECTOR_MODES
+
+    results = {}
+    for mode in VECTOR_MODES:
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", mode],
+            cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+        ).stdout
+        results[mode] = json.loads(out.strip().splitlines()[-1])
+
+    full = results["full"]
+    print(f"{'mode':8s} {'vector table':>14s} {'process RSS':>12s} {'ms/question':>12s}  same pick (corpus | held out)")
+    for mode, r in results.items():
+        same = {
+            name: sum(a == b for a, b in zip(full["picks"][name], r["picks"][name])) / max(1, len(full["picks"][name]))
+            for name in ("corpus", "held_out")
+        }
+        r["same_pick"] = {name: round(value, 3) for name, value in same.items()}
+        print(f"{mode:8s} {r['table_bytes'] / 2 ** 20:11.2f} MB {r['rss_mb'] or 0:9.1f} MB {r['cpu_ms']:12.3f}  "
+              f"{same['corpus']:.1%} | {same['held_out']:.1%}")
+    for r in results.values():
+        del r["picks"]
+
+    saved = full["table_bytes"] - min(r["table_bytes"] for r in results.values())
+    print(f"\nVector table: up to {saved / 2 ** 20:.1f} MB less per process.")
+    print(f"Results saved to {write_results('vectors', {'modes': results})}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--child":
+        run_mode(sys.argv[2])
+    else:
+        main()
@@ -0,0 +1,60 @@
+"""
+Scaling benchmark for the worker-process pool: questions/sec against the
+number of worker processes.
+
+Run from the project folder:
+    python benchmarks/bench_workers.py [total_questions] [batch_size]
+"""
+import copy
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import all_questions
+
+from src.suspect_data import load_scenario
+from src.worker_pool import WorkerPool
+
+QUESTIONS = all_questions()
+
+
+def make_batches(suspects, total, batch_size):
+    rng = random.Random(0)
+    batches = []
+    for start in range(0, total, batch_size):
+        size = min(batch_size, total - start)
+        batches.append([(rng.choice(QUESTIONS), copy.copy(rng.choice(suspects))) for _ in range(size)])
+    return batches
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+
+    scenario = load_scenario("data/scenario_generated.json")
+    suspects = scenario["suspects"]
+
+    counts = [1]
+    while counts[-1] * 2 <= (os.cpu_count() or 1):
+        counts.append(counts[-1] * 2)
+
+    baseline = None
+    for workers in counts:
+        pool = WorkerPool(scenario["path"], workers=workers, cache_size=0)
+        pool.warm_up()
+        batches = make_batches(suspects, total, batch_size)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as threads:
+            list(threads.map(pool.parse_batch, batches))
+        qps = total / (time.perf_counter() - start)
+        pool.close()
+
+        baseline = baseline or qps
+        print(f"{workers:3d} workers: {qps:9.1f} questions/sec ({qps / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
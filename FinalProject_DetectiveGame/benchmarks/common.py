@@ -0,0 +1,95 @@
+"""
+Shared helpers for the benchmark scripts: question corpus, percentiles,
+peak memory and writing results to benchmarks/results/.
+"""
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+if PROJECT_DIR not in sys.path:
+    sys.path.insert(0, PROJECT_DIR)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def load_questions():
+    """Returns the question corpus: {category: [questions]}."""
+    with open(os.path.join(BENCH_DIR, "questions.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def all_questions():
+    """The whole corpus as one flat list."""
+    return [q for questions in load_questions().values() for q in questions]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[max(0, min(len(ordered), rank) - 1)]
+
+
+def latency_summary(latencies_ms):
+    return {
+        "count": len(latencies_ms),
+        "p50_ms": round(percentile(latencies_ms, 50), 4),
+        "p95_ms": round(percentile(latencies_ms, 95), 4),
+        "p99_ms": round(percentile(latencies_ms, 99), 4),
+        "max_ms": round(max(latencies_ms), 4) if latencies_ms else 0.0,
+    }
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB (None where not available)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def environment():
+    """Where and on what the benchmark ran, so results can be compared fairly."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_DIR,
+            capture_output=True, text=True
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+    try:
+        import spacy
+        spacy_version = spacy.__version__
+    except ImportError:
+        spacy_version = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "spacy": spacy_version,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def write_results(name, results):
+    """Saves results as benchmarks/results/<name>-<timestamp>.json and returns the path."""
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(RESULTS_DIR, f"{name}-{stamp}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(dict(results, benchmark=name, timestamp=stamp, environment=environment()), f, indent=2)
+    return path
@@ -0,0 +1,255 @@
+"""
+Load simulator: many detective agents play whole games at the same time
+(GameSession rules, one shared DetectiveBrain, questions batched like the server).
+
+Run from the project folder:
+    python benchmarks/simulate_games.py --games 1000 --concurrency 64
+    python benchmarks/simulate_games.py --scenario data/a.json --scenario data/b.json
+    python benchmarks/simulate_games.py --library 20 --agents detective
+
+Agents:
+    random     random corpus questions to random suspects, accuses a random suspect
+    detective  asks everyone the story/time questions, accuses the suspect the
+               others mention most in their answers
+    oracle     plays like 'random' but always names solution.killer (success path)
+
+Reports games/sec, questions/sec, latency percentiles and how often the killer
+was discoverable: mentioned by name in another suspect's answer during the game.
+"""
+import argparse
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import latency_summary, load_questions, peak_rss_mb, write_results
+
+from src.batching import BatchScheduler
+from src.game import GameError, GameSession
+from src.library import ScenarioLibrary
+from src.nlp import DEFAULT_PROFILE, PIPELINE_PROFILES, DetectiveBrain
+from src.suspect_data import build_scenario, load_scenario
+from src.vectors import VECTOR_MODES
+
+AGENTS = ("random", "detective", "oracle")
+TITLES = {"dr", "dr.", "mr", "mr.", "mrs", "mrs.", "ms", "ms.", "lord", "lady", "sir", "captain", "professor"}
+
+
+# --- agents ---
+# next_action(game, rng) -> ("ask", suspect number, question) or ("accuse", name)
+
+class RandomAgent:
+    def __init__(self, game, questions, rng, accuse_chance=0.2):
+        self.questions = [q for qs in questions.values() for q in qs]
+        self.accuse_chance = accuse_chance
+
+    def next_action(self, game, rng):
+        if game.can_accuse and rng.random() < self.accuse_chance:
+            return ("accuse", self.guess(game, rng))
+        return ("ask", rng.randrange(len(game.suspects)) + 1, rng.choice(self.questions))
+
+    def guess(self, game, rng):
+        return rng.choice(game.suspects).name
+
+    def heard(self, suspect, answer):
+        pass
+
+
+class OracleAgent(RandomAgent):
+    def guess(self, game, rng):
+        return game.scenario["meta"]["solution"]["killer"]
+
+
+class DetectiveAgent:
+    """Questions every suspect in turn and follows the names in the answers."""
+    def __init__(self, game, questions, rng, accuse_after=20):
+        self.suspects = game.suspects
+        self.questions = questions["story"] + questions["time"]
+        rng.shuffle(self.questions)  # each detective has their own order
+        self.accuse_after = accuse_after
+        self.asked = 0
+        self.mentions = {}
+
+    def next_action(self, game, rng):
+        if game.can_accuse and (self.asked >= self.accuse_after or game.turns_left <= 1):
+            if self.mentions:
+                return ("accuse", max(self.mentions, key=self.mentions.get))
+            return ("accuse", rng.choice(game.suspects).name)
+        turn, number = divmod(self.asked, len(game.suspects))
+        self.asked += 1
+        return ("ask", number + 1, self.questions[turn % len(self.questions)])
+
+    def heard(self, suspect, answer):
+        for name in mentioned_names(answer, self.suspects, exclude=suspect):
+            self.mentions[name] = self.mentions.get(name, 0) + 1
+
+
+def name_parts(name):
+    """'Dr. Aris Thorne' -> {'aris', 'thorne', 'dr. aris thorne'} (titles are no clue)."""
+    words = [w for w in name.lower().split() if w not in TITLES and len(w) > 2]
+    return set(words) | {name.lower()}
+
+
+def mentioned_names(answer, suspects, exclude=None):
+    """Names of the suspects (other than 'exclude') that an answer talks about."""
+    text = answer.lower()
+    return [s.name for s in suspects if s.name != exclude and any(p in text for p in name_parts(s.name))]
+
+
+def make_agent(kind, game, questions, rng):
+    if kind == "detective":
+        return DetectiveAgent(game, questions, rng)
+    if kind == "oracle":
+        return OracleAgent(game, questions, rng)
+    return RandomAgent(game, questions, rng)
+
+
+# --- one game ---
+
+async def play(scheduler, scenario, kind, questions, rng, latencies):
+    game = GameSession(scenario)
+    agent = make_agent(kind, game, questions, rng)
+    killer = scenario["meta"]["solution"]["killer"]
+    discovered = False
+    asked = 0
+
+    while not game.outcome:
+        action = agent.next_action(game, rng)
+        if action[0] == "accuse":
+            game.accuse(action[1])
+            break
+
+        start = time.perf_counter()
+        suspect, intents, reply = game.start_question(action[1], action[2])
+        if reply["answer"] is None:
+            reply["answer"] = await scheduler.parse(action[2], suspect, intents)
+        game.finish_question(reply)
+        latencies.append((time.perf_counter() - start) * 1000)
+        asked += 1
+
+        agent.heard(suspect.name, reply["answer"])
+        if killer in mentioned_names(reply["answer"], game.suspects, exclude=suspect.name):
+            discovered = True
+
+    return {"agent": kind, "outcome": game.outcome, "score": game.score, "questions": asked, "discovered": discovered}
+
+
+async def run(scheduler, scenarios, agents, games, concurrency, questions, seed):
+    latencies = []
+    results = []
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        rng = random.Random(seed * 1000003 + i)
+        async with slots:
+            try:
+                results.append(await play(scheduler, scenarios[i % len(scenarios)], agents[i % len(agents)], questions, rng, latencies))
+            except (GameError, ValueError) as e:
+                results.append({"agent": agents[i % len(agents)], "outcome": "error", "error": str(e)})
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one(i) for i in range(games)])
+    return results, latencies, time.perf_counter() - start
+
+
+# --- setup & report ---
+
+def load_scenarios(args, brain):
+    scenarios = []
+    for path in args.scenario or ["data/scenario_generated.json"]:
+        scenario = load_scenario(path)
+        if scenario:
+            scenarios.append(scenario)
+    if args.library:
+        library = ScenarioLibrary()
+        for case in library.list(limit=args.library):
+            scenarios.append(build_scenario(library.get(case["id"])))
+        library.close()
+
+    # a compact vector table has to know the words of ALL scenarios up front
+    brain.compact_vectors([s.story_text for scenario in scenarios for s in scenario["suspects"]])
+    for scenario in scenarios:
+        brain.compile_scenario(scenario["suspects"], source=scenario["path"])
+    return scenarios
+
+
+def summarize(results):
+    games = [r for r in results if r["outcome"] != "error"]
+    by_agent = {}
+    for kind in sorted({r["agent"] for r in games}):
+        mine = [r for r in games if r["agent"] == kind]
+        by_agent[kind] = {
+            "games": len(mine),
+            "solved": round(sum(r["outcome"] == "success" for r in mine) / len(mine), 3),
+            "discoverable": round(sum(r["discovered"] for r in mine) / len(mine), 3),
+            "avg_questions": round(sum(r["questions"] for r in mine) / len(mine), 1),
+            "avg_score": round(sum(r["score"] for r in mine) / len(mine), 1),
+        }
+    return {
+        "games": len(games),
+        "errors": len(results) - len(games),
+        "discoverable": round(sum(r["discovered"] for r in games) / max(1, len(games)), 3),
+        "agents": by_agent,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plays many simulated games against one brain")
+    parser.add_argument("--scenario", action="append", help="scenario JSON (can be given more than once)")
+    parser.add_argument("--library", type=int, default=0, help="also play the N newest mysteries of the case library")
+    parser.add_argument("--games", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=32, help="games running at the same time")
+    parser.add_argument("--agents", default=",".join(AGENTS), help="comma separated: " + ", ".join(AGENTS))
+    parser.add_argument("--batch-size", type=int, default=16, help="max questions per nlp.pipe call (1 = no batching)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--vectors", choices=VECTOR_MODES, default="full", help="word vector table of the brain")
+    parser.add_argument("--profile", choices=list(PIPELINE_PROFILES), default=DEFAULT_PROFILE, help="spaCy pipeline profile")
+    args = parser.parse_args()
+
+    agents = [a.strip() for a in args.agents.split(",") if a.strip() in AGENTS]
+    if not agents:
+        parser.error(f"--agents must name at least one of {', '.join(AGENTS)}")
+
+    start = time.perf_counter()
+    brain = DetectiveBrain(profile=args.profile, vectors=args.vectors)
+    scenarios = load_scenarios(args, brain)
+    if not scenarios:
+        print("❌ No scenario to play.")
+        return
+    setup_s = time.perf_counter() - start
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    scheduler = BatchScheduler(brain, executor, max_batch=args.batch_size)
+    results, latencies, seconds = asyncio.run(
+        run(scheduler, scenarios, agents, args.games, args.concurrency, load_questions(), args.seed)
+    )
+    executor.shutdown()
+
+    summary = summarize(results)
+    report = dict(
+        summary,
+        scenarios=len(scenarios),
+        concurrency=args.concurrency,
+        setup_s=round(setup_s, 2),
+        seconds=round(seconds, 2),
+        games_per_sec=round(summary["games"] / seconds, 1),
+        questions_per_sec=round(len(latencies) / seconds, 1),
+        question_latency=latency_summary(latencies),
+        batching=scheduler.stats(),
+        peak_rss_mb=peak_rss_mb(),
+    )
+
+    lat = report["question_latency"]
+    print(f"🎮 {summary['games']} games on {len(scenarios)} scenario(s) in {seconds:.1f}s "
+          f"(setup {setup_s:.1f}s, {summary['errors']} errors)")
+    print(f"   {report['games_per_sec']} games/sec, {report['questions_per_sec']} questions/sec")
+    print(f"   question latency p50 {lat['p50_ms']} ms | p95 {lat['p95_ms']} ms | p99 {lat['p99_ms']} ms | max {lat['max_ms']} ms")
+    print(f"🔎 killer discoverable from the answers in {summary['discoverable']:.0%} of the games")
+    for kind, stats in summary["agents"].items():
+        print(f"   {kind:10s} {stats['games']:5d} games | solved {stats['solved']:.0%} | "
+              f"discoverable {stats['discoverable']:.0%} | {stats['avg_questions']} questions | score {stats['avg_score']}")
+    print(f"Results saved to {write_results('simulate_games', report)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
+import argparse
 import sys
 import os
+import time
 
 # Rich for better terminal UI
 try:
@@ -11,20 +13,80 @@ except ImportError:
     HAS_RICH = False
     print("NOTE: Install 'rich' for better colors (pip install rich)")
 
-# Project modules
+# Project modules (spaCy & the Gemini client are imported later, only when needed)
 from src.suspect_data import load_scenario
-from src.nlp import DetectiveBrain
-from src.generator import generate_mystery, save_scenario
+from src.game import GameSession
+from src import generator
+from src.generator import OUTPUT_FILE, generate_mystery, save_scenario
+from src.library import ScenarioLibrary
+from src.scenario_pool import RANDOM_THEME, ScenarioPool
 
 def clear_screen():
     os.system('cls' if os.name == 'nt' else 'clear')
 
-def main_menu(console):
+def start_scenario_pool():
+    """Starts pre-generating random mysteries in the background (only with an API key)."""
+    if not generator.get_api_key(ask=False):
+        return None
+    quiet = lambda *args: None
+    pool = ScenarioPool(generate=lambda theme: generate_mystery(theme, ask_key=False, log=quiet)[0])
+    return pool.start()
+
+def show_generation_progress(console):
+    """
+    Callback for the streamed generation: prints the title, the intro and
+    each suspect as soon as the AI has finished writing them.
+    """
+    def on_value(path, value):
+        if path == ("meta", "title"):
+            if HAS_RICH:
+                console.print(Panel.fit(f"[bold cyan]{value}[/bold cyan]", border_style="blue"))
+            else:
+                print(f"--- {value} ---")
+        elif path == ("meta", "intro_text"):
+            print(value)
+        elif path[0] == "suspects":
+            if HAS_RICH:
+                console.print(f"🧑 [bold green]{value.get('name', '???')}[/bold green] [dim]{value.get('bio', '')}[/dim]")
+            else:
+                print(f"🧑 {value.get('name', '???')}: {value.get('bio', '')}")
+    return on_value
+
+def pick_from_library(console, library):
+    """
+    Lists the stored mysteries (newest first) and makes the chosen one the current mystery.
+    Returns True if one was picked.
+    """
+    cases = library.list(limit=20)
+    clear_screen()
+    if HAS_RICH:
+        console.print(Panel.fit(f"[bold magenta]📚 CASE LIBRARY ({len(library)} mysteries)[/bold magenta]", border_style="magenta"))
+    else:
+        print(f"--- CASE LIBRARY ({len(library)} mysteries) ---")
+
+    for i, case in enumerate(cases):
+        created = time.strftime("%Y-%m-%d", time.localtime(case["created"]))
+        line = f"{i + 1}. {case['title']} ({case['suspect_count']} suspects, {created})"
+        if HAS_RICH:
+            console.print(line)
+        else:
+            print(line)
+
+    choice = input("\nNumber of the case (Enter to go back): ").strip()
+    if not choice.isdigit() or not 0 < int(choice) <= len(cases):
+        return False
+
+    # only the chosen mystery is read from the library
+    data = library.get(cases[int(choice) - 1]["id"])
+    return save_scenario(data)
+
+def main_menu(console, pool=None):
     """
     Handles the startup choice.
     Returns True if a valid scenario exists and we should play.
     Returns False (or exits) if the user quits.
     """
+    library = ScenarioLibrary()
     while True:
         clear_screen()
         if HAS_RICH:
@@ -32,7 +94,11 @@ def main_menu(console):
         else:
             print("--- AI DETECTIVE ENGINE ---")
 
-        has_save = os.path.exists("data/scenario_generated.json")
+        has_save = os.path.exists(OUTPUT_FILE)
+
+        if has_save and not len(library):
+            library.import_file(OUTPUT_FILE)  # mysteries from before the library existed
+        has_library = len(library) > 0
         
         # --- RENDER MENU ---
         if HAS_RICH:
@@ -42,6 +108,8 @@ def main_menu(console):
             else:
                 console.print("[dim]No mystery found. You must generate one.[/dim]")
                 console.print("1. [bold cyan]Generate NEW Mystery[/bold cyan]")
+            if has_library:
+                console.print(f"4. [bold yellow]Case Library[/bold yellow] ({len(library)} mysteries)")
             
             console.print("3. Exit")
             choice = Prompt.ask("\nSelection")
@@ -51,6 +119,8 @@ def main_menu(console):
                 print("2. Generate NEW Mystery")
             else:
                 print("1. Generate NEW Mystery")
+            if has_library:
+                print(f"4. Case Library ({len(library)} mysteries)")
             print("3. Exit")
             choice = input("\nSelection: ")
 
@@ -58,6 +128,13 @@ def main_menu(console):
         if choice == "3" or (choice.lower() == "exit"):
             sys.exit(0)
 
+        # CASE LIBRARY
+        if has_library and choice == "4":
+            if pick_from_library(console, library):
+                input("\nPress Enter to start the case...")
+                return True
+            continue
+
         is_generating_new = (has_save and choice == "2") or (not has_save and choice == "1")
         is_playing_existing = (has_save and choice == "1")
 
@@ -70,18 +147,30 @@ def main_menu(console):
                 print("\n--- Create Your Mystery ---")
                 theme = input("Enter a theme, setting, or era (or press Enter for a random surprise): ")
             
+            data = None
             if not theme.strip():
                 print("🎲 No theme selected... choosing a random one!")
-                theme = "A murder mystery with a unique, randomly selected theme and setting."
+                theme = RANDOM_THEME
+                # a random one may already be waiting in the pool
+                data = pool.pop() if pool else None
+                if data:
+                    print("⚡ Took a ready-made mystery from the pool.")
             
             try:
-                data = generate_mystery(theme)
-                if save_scenario(data):
+                if not data:
+                    data, stats = generate_mystery(theme, on_value=show_generation_progress(console))
+                    if data and stats.get("streamed"):
+                        print(f"⏱️  First text after {stats['first_content_s']:.1f}s, complete after {stats['total_s']:.1f}s")
+                if save_scenario(data, theme):
                     input("\nScenario saved! Press Enter to start the case...")
                     return True 
                 else:
                     input("\n❌ Save failed. Press Enter to try again...")
                     continue
+            except generator.QuotaExceeded as e:
+                print(f"\n⚠️  The AI is busy (quota limit). Try again in about {e.retry_after} seconds, or replay a case from the library.")
+                input("Press Enter to return to menu...")
+                continue
             except Exception as e:
                 print(f"\n❌ Generation Error: {e}")
                 input("Press Enter to return to menu...")
@@ -91,26 +180,27 @@ def main_menu(console):
         if is_playing_existing:
             return True 
 
-def interrogate_suspect(console, brain, suspect, turns_left, score):
+def interrogate_suspect(console, game, suspect):
     """
     Handles the loop of questioning a single suspect.
-    Returns updated (turns_left, score).
+    The rules (turns, score, insults) are in game.ask().
     """
     clear_screen()
     
     if HAS_RICH:
         console.print(f"[bold green]Interrogating: {suspect.name}[/bold green]")
         console.print(f"[dim]{suspect.bio}[/dim]")
-        console.print(f"[bold yellow]Turns Left: {turns_left} | Score: {score}[/bold yellow]")
+        console.print(f"[bold yellow]Turns Left: {game.turns_left} | Score: {game.score}[/bold yellow]")
         console.print("[italic]Type 'back' to return.[/italic]\n")
     else:
         print(f"Interrogating: {suspect.name}")
         print(f"Bio: {suspect.bio}")
-        print(f"Turns: {turns_left} | Score: {score}")
+        print(f"Turns: {game.turns_left} | Score: {game.score}")
         print("Type 'back' to return.\n")
     
+    number = game.suspects.index(suspect) + 1
     while True:
-        if turns_left <= 0:
+        if game.outcome:
             break
 
         if HAS_RICH:
@@ -121,49 +211,44 @@ def interrogate_suspect(console, brain, suspect, turns_left, score):
         if user_input.lower() in ["back", "return", "exit", ""]:
             break
 
-        turns_left -= 1
-        score -= 10
+        reply = game.ask(number, user_input)
 
-        # Insult check
-        insults = ["idiot", "stupid", "dumb", "liar", "shut up", "ugly", "crazy", "fuck", "shit"]
-        user_lower = user_input.lower()
-        is_pure_insult = any(word in user_lower for word in insults)
-        
-        if is_pure_insult:
-            suspect.decrease_willingness(15)
-            score -= 50
-            msg = f"! {suspect.name} is offended by your language."
+        for note in reply["notes"]:
+            msg = f"! {note}"
             if HAS_RICH:
                 console.print(f"[bold red]{msg}[/bold red]")
             else:
                 print(msg)
         
-        if suspect.willingness <= 0:
-            msg = f"{suspect.name}: I am done talking to you."
+        if reply["refused"]:
+            msg = f"{suspect.name}: {reply['answer']}"
             if HAS_RICH:
                 console.print(Panel(f"[red]{msg}[/red]"))
             else:
                 print(msg)
             continue 
-            
-        response = brain.parse(user_input, suspect)
         
         if HAS_RICH:
-            console.print(f"[bold blue]{suspect.name}[/bold blue]: {response}")
-            console.print(f"[dim](Turns: {turns_left})[/dim]")
+            console.print(f"[bold blue]{suspect.name}[/bold blue]: {reply['answer']}")
+            console.print(f"[dim](Turns: {reply['turns_left']})[/dim]")
         else:
-            print(f"{suspect.name}: {response}")
-            print(f"(Turns: {turns_left})")
-
-    return turns_left, score
+            print(f"{suspect.name}: {reply['answer']}")
+            print(f"(Turns: {reply['turns_left']})")
 
 def main():
+    parser = argparse.ArgumentParser(description="AI Detective: an NLP-driven murder mystery")
+    # the names of src.nlp.PIPELINE_PROFILES (src.nlp itself is only imported when a case starts)
+    parser.add_argument("--profile", choices=["full", "fast"], default="full",
+                        help="fast: skips the spaCy parser for questions (same answers, less CPU)")
+    args = parser.parse_args()
+
     if HAS_RICH:
         console = Console()
     else:
         console = None
         
-    if not main_menu(console):
+    pool = start_scenario_pool()
+    if not main_menu(console, pool):
         return
     
     # Initialize Game
@@ -171,37 +256,35 @@ def main():
     print("Initializing Detective AI System...")
     
     try:
-        brain = DetectiveBrain()
+        from src.nlp import DetectiveBrain
+        brain = DetectiveBrain(profile=args.profile)
     except Exception as e:
         print(f"\nCRITICAL ERROR: Could not load NLP model. {e}")
         print("Make sure you ran: python -m spacy download en_core_web_md")
         return
 
-    scenario_data = load_scenario("data/scenario_generated.json")
+    scenario_data = load_scenario(OUTPUT_FILE)
     if not scenario_data:
         print("\n❌ FAILED: No generated story found.")
         return
 
-    suspects = scenario_data["suspects"]
+    brain.compile_scenario(scenario_data["suspects"], source=scenario_data["path"])
+    game = GameSession(scenario_data, brain)
+    suspects = game.suspects
     meta = scenario_data["meta"]
     outcomes = scenario_data["outcomes"]
-    solution = meta["solution"]
-    
-    START_TURNS = 30
-    turns_left = START_TURNS
-    score = 1000
 
     # Intro
     clear_screen()
     if HAS_RICH:
         console.print(Panel.fit(f"[bold cyan]{meta['title']}[/bold cyan]", border_style="blue"))
         console.print(meta['intro_text'])
-        console.print(f"\n[bold yellow]MISSION: Solve the case in {turns_left} turns.[/bold yellow]")
+        console.print(f"\n[bold yellow]MISSION: Solve the case in {game.turns_left} turns.[/bold yellow]")
         console.print("[italic]Press Enter to enter the interrogation room...[/italic]")
     else:
         print(f"--- {meta['title']} ---")
         print(meta['intro_text'])
-        print(f"\nMISSION: Solve the case in {turns_left} turns.")
+        print(f"\nMISSION: Solve the case in {game.turns_left} turns.")
         print("\nPress Enter to begin...")
         
     input() 
@@ -210,43 +293,39 @@ def main():
     while True:
         clear_screen()
         
-        if turns_left <= 0:
+        if game.outcome == "timeout":
             if HAS_RICH:
                 console.print(Panel(outcomes['timeout'], title="[bold red]GAME OVER[/bold red]", border_style="red"))
-                console.print(f"Final Score: {score}")
+                console.print(f"Final Score: {game.score}")
             else:
                 print("GAME OVER")
                 print(outcomes['timeout'])
-                print(f"Final Score: {score}")
+                print(f"Final Score: {game.score}")
             break
 
-        # lock logic
-        can_accuse = turns_left <= (START_TURNS - 10)
-        turns_until_unlock = turns_left - (START_TURNS - 10)
-        
         # Display Menu
         if HAS_RICH:
-            console.print(f"[bold yellow]TURNS: {turns_left} | SCORE: {score}[/bold yellow]")
+            console.print(f"[bold yellow]TURNS: {game.turns_left} | SCORE: {game.score}[/bold yellow]")
             console.print("[bold]SUSPECT LIST:[/bold]")
             for i, s in enumerate(suspects):
                 console.print(f"{i + 1}. {s.name}")
             
-            if can_accuse:
+            if game.can_accuse:
                 console.print("\n[dim]Options: Type number to talk, 'accuse' to solve, 'exit' to quit.[/dim]")
             else:
-                console.print(f"\n[dim]Options: Type number to talk. (Accusation unlocks in {turns_until_unlock} turns)[/dim]")
+                console.print(f"\n[dim]Options: Type number to talk. (Accusation unlocks in {game.turns_until_unlock} turns)[/dim]")
             
             choice = Prompt.ask("Selection")
         else:
-            print(f"TURNS: {turns_left} | SCORE: {score}")
+            print(f"TURNS: {game.turns_left} | SCORE: {game.score}")
             print("SUSPECT LIST:")
             for i, s in enumerate(suspects):
                 print(f"{i + 1}. {s.name}")
             
-            if can_accuse:
+            if game.can_accuse:
                 print("\nOptions: Type number to talk, 'accuse' to solve.")
             else:
-                print(f"\nOptions: Type number to talk. (Accusation unlocks in {turns_until_unlock} turns)")
+                print(f"\nOptions: Type number to talk. (Accusation unlocks in {game.turns_until_unlock} turns)")
 
             choice = input("\nSelection: ")
         
@@ -256,46 +335,39 @@ def main():
             break
             
         if choice.lower() == "accuse":
-            if not can_accuse:
-                print(f"\n❌ You need to gather more evidence! Come back in {turns_until_unlock} turns.")
+            if not game.can_accuse:
+                print(f"\n❌ You need to gather more evidence! Come back in {game.turns_until_unlock} turns.")
                 input("Press Enter...")
                 continue
                 
             print("\nWHO IS THE KILLER?")
             guess = input("Type the name: ")
+            result = game.accuse(guess)
             
-            if solution["killer"].lower() in guess.lower():
-                score += 500
-                rank = "Rookie"
-                if score > 1200: rank = "Master Detective"
-                elif score > 800: rank = "Private Investigator"
-
+            if result["outcome"] == "success":
                 if HAS_RICH:
-                    console.print(Panel(outcomes['success'], title="[bold green]CASE SOLVED[/bold green]", border_style="green"))
-                    console.print(f"[bold yellow]FINAL SCORE: {score} ({rank})[/bold yellow]")
+                    console.print(Panel(result['text'], title="[bold green]CASE SOLVED[/bold green]", border_style="green"))
+                    console.print(f"[bold yellow]FINAL SCORE: {result['score']} ({result['rank']})[/bold yellow]")
                 else:
                     print("CASE SOLVED")
-                    print(outcomes['success'])
-                    print(f"FINAL SCORE: {score} ({rank})")
+                    print(result['text'])
+                    print(f"FINAL SCORE: {result['score']} ({result['rank']})")
                 
-                print(f"\nMotive: {solution['motive']}")
-                break
+                print(f"\nMotive: {result['motive']}")
             else:
-                score -= 300 
                 if HAS_RICH:
-                    console.print(Panel(outcomes['failure'], title="[bold red]WRONG ACCUSATION[/bold red]", border_style="red"))
-                    console.print(f"[bold red]FINAL SCORE: {score}[/bold red]")
+                    console.print(Panel(result['text'], title="[bold red]WRONG ACCUSATION[/bold red]", border_style="red"))
+                    console.print(f"[bold red]FINAL SCORE: {result['score']}[/bold red]")
                 else:
                     print("WRONG ACCUSATION")
-                    print(outcomes['failure'])
-                    print(f"FINAL SCORE: {score}")
-                break 
+                    print(result['text'])
+                    print(f"FINAL SCORE: {result['score']}")
+            break 
 
         if choice.isdigit():
             idx = int(choice) - 1
             if 0 <= idx < len(suspects):
-                active_suspect = suspects[idx]
-                turns_left, score = interrogate_suspect(console, brain, active_suspect, turns_left, score)
+                interrogate_suspect(console, game, suspects[idx])
             else:
                 print("Invalid number.")
                 input("Press Enter...")
@@ -0,0 +1,61 @@
+"""
+Approximate nearest-neighbour search for very big stories (thousands of sentences).
+
+Random-projection LSH: every table cuts the vector space with a few random
+hyperplanes, and sentences on the same side of all of them share a bucket.
+A question only looks at the sentences in its own buckets (plus the buckets one
+cut away), and only those get the exact score. Below ~10,000 sentences the
+full scan is just as fast (see benchmarks/bench_ann.py), so it stays the default.
+"""
+import numpy as np
+
+
+class RandomProjectionLSH:
+    def __init__(self, vectors, n_tables=8, n_bits=12, seed=0):
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        dims = vectors.shape[1]
+
+        rng = np.random.default_rng(seed)
+        # (tables * bits) x dims: all hyperplanes in one matrix, so hashing is one product
+        self.planes = rng.standard_normal((n_tables * n_bits, dims)).astype("float32")
+        self.powers = (1 << np.arange(n_bits)).astype("int64")
+
+        # --- buckets: one dict per table, code -> sentence ids ---
+        codes = self.hash(vectors)
+        self.tables = []
+        for t in range(n_tables):
+            order = np.argsort(codes[:, t], kind="stable")
+            sorted_codes = codes[order, t]
+            starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+            ends = np.r_[starts[1:], len(order)]
+            self.tables.append({
+                int(sorted_codes[s]): order[s:e].astype("int32") for s, e in zip(starts, ends)
+            })
+
+    def hash(self, vectors):
+        """Bucket code of every vector in every table: (n x tables) integers."""
+        bits = (np.atleast_2d(vectors) @ self.planes.T) > 0
+        bits = bits.reshape(len(bits), self.n_tables, self.n_bits)
+        return bits.astype("int64") @ self.powers
+
+    def candidates(self, q_vector, probe=True):
+        """
+        Sentence ids that may be close to the question vector.
+        With probe=True the buckets that differ in one cut are searched too
+        (better recall for a few more candidates).
+        """
+        codes = self.hash(q_vector)[0]
+        found = []
+        for table, code in zip(self.tables, codes):
+            rows = table.get(int(code))
+            if rows is not None:
+                found.append(rows)
+            if probe:
+                for bit in self.powers:
+                    rows = table.get(int(code ^ bit))
+                    if rows is not None:
+                        found.append(rows)
+        if not found:
+            return np.zeros(0, dtype="int32")
+        return np.unique(np.concatenate(found))
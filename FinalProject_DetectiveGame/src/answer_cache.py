@@ -0,0 +1,95 @@
+import re
+import time
+from collections import OrderedDict
+
+# punctuation is dropped, but ":" and anything between two digits stay
+# because they matter for times like 8:30 or 8.30
+PUNCTUATION = re.compile(r"(?<!\d)[^\w\s:]|[^\w\s:](?!\d)")
+
+# DetectiveBrain looks at these letter by letter (times, "did you", "who", "killer"),
+# so words containing them are never swapped for their lemma ("earlier" != "early")
+SURFACE = re.compile(r"\d|you|who|killer|earlier|later|eight")
+
+
+class AnswerCache:
+    """
+    Bounded LRU + TTL cache for DetectiveBrain.decide().
+
+    Key: the suspect + the question, lowercased, without punctuation and with every
+    word replaced by its lemma ("where were you at 9?" == "Where was you at 9"),
+    plus the 'facts' decide() reads from the raw text (DetectiveBrain.cache_facts).
+    The lemmas are learned from the questions spaCy has already parsed,
+    so building a key never needs the pipeline.
+
+    Only the decision is cached (which branch / which sentence). The stateful part
+    (annoyance, willingness, random prefixes) still runs on every answer.
+    """
+    def __init__(self, max_size=2048, ttl=600.0, keep_words=(), max_words=50000):
+        self.max_size = max_size
+        self.keep_words = set(keep_words)  # e.g. the greetings, checked as typed
+        self.ttl = ttl
+        self.max_words = max_words
+        self.entries = OrderedDict()  # key -> (expires_at, outcome)
+        self.lemma_of = {}            # word -> lemma, learned from parsed questions
+
+        # --- stats ---
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def normalize(self, msg):
+        words = PUNCTUATION.sub("", msg.lower()).split()
+        return " ".join(self.lemma_of.get(w, w) for w in words)
+
+    def key(self, suspect, msg, facts=()):
+        # story_text identifies the scenario too (ids like "butler" repeat across mysteries)
+        return (suspect.id, suspect.story_text, facts, self.normalize(msg))
+
+    def get(self, suspect, msg, facts=()):
+        key = self.key(suspect, msg, facts)
+        entry = self.entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self.entries[key]
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, suspect, msg, doc, outcome, facts=()):
+        self.learn(doc)
+        key = self.key(suspect, msg, facts)
+        self.entries[key] = (time.monotonic() + self.ttl, outcome)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def learn(self, doc):
+        """Remembers word -> lemma from a parsed question (first one seen wins)."""
+        if len(self.lemma_of) >= self.max_words:
+            return
+        for token in doc:
+            word = PUNCTUATION.sub("", token.lower_)
+            if token.is_punct or not word or word in self.keep_words or SURFACE.search(word):
+                continue
+            self.lemma_of.setdefault(word, token.lemma_.lower())
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+    def __bool__(self):
+        # an empty cache is still "on"
+        return self.max_size > 0
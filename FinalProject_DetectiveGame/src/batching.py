@@ -0,0 +1,71 @@
+import asyncio
+
+
+class BatchScheduler:
+    """
+    Collects questions that arrive at (almost) the same time and answers them
+    together with one nlp.pipe call (DetectiveBrain.parse_batch).
+
+    A batch is sent off when it reaches 'max_batch' questions or when the
+    first question in it has waited 'max_latency' seconds, whatever comes first.
+    """
+    def __init__(self, brain, executor, max_batch=16, max_latency=0.005):
+        self.brain = brain
+        self.executor = executor  # spaCy runs here, never inside the event loop
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+        self.pending = []
+        self.timer = None
+
+        # --- stats ---
+        self.batches = 0
+        self.questions = 0
+
+    async def parse(self, msg, suspect, intents=None):
+        """
+        Same result as brain.parse(msg, suspect, intents), but batched with other callers.
+        'intents' (IntentRouter.scan of the question) is passed on, so the brain doesn't scan again.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((msg, suspect, intents, future))
+
+        if len(self.pending) >= self.max_batch:
+            self.flush()
+        elif self.timer is None:
+            self.timer = loop.call_later(self.max_latency, self.flush)
+
+        return await future
+
+    def flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if not self.pending:
+            return
+
+        batch, self.pending = self.pending, []
+        self.batches += 1
+        self.questions += len(batch)
+
+        loop = asyncio.get_running_loop()
+        requests = [(m, s) for m, s, _, _ in batch]
+        job = loop.run_in_executor(self.executor, self.brain.parse_batch, requests, [i for _, _, i, _ in batch])
+        job.add_done_callback(lambda done: self.deliver(batch, done))
+
+    @staticmethod
+    def deliver(batch, done):
+        """Fans the answers of a batch back out to the waiting callers."""
+        error = done.exception()
+        answers = None if error else done.result()
+        for i, (_, _, _, future) in enumerate(batch):
+            if future.cancelled():
+                continue
+            if error:
+                future.set_exception(error)
+            else:
+                future.set_result(answers[i])
+
+    def stats(self):
+        avg = self.questions / self.batches if self.batches else 0.0
+        return {"batches": self.batches, "questions": self.questions, "avg_batch_size": round(avg, 2)}
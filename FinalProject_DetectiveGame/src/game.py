@@ -0,0 +1,171 @@
+"""
+The game rules without any input()/print(): turns, score, insults, the accusation
+lock and the outcome. main.py (terminal) and src/server.py (HTTP) are only
+clients of GameSession, and scripts can play thousands of games with it.
+
+    game = GameSession(scenario, brain)
+    game.ask(1, "Where were you at 9?")   -> dict with the answer and the new state
+    game.accuse("Dr. Aris Thorne")        -> dict with the outcome
+    game.state()                          -> turns, score, suspects, outcome
+"""
+from .intents import IntentRouter
+from .models import new_game
+
+START_TURNS = 30
+START_SCORE = 1000
+ACCUSE_AFTER = 10  # questions to ask before an accusation is allowed
+
+QUESTION_COST = 10
+INSULT_COST = 50
+INSULT_WILLINGNESS = 15
+SOLVED_BONUS = 500
+WRONG_ACCUSATION_COST = 300
+
+REFUSAL = "I am done talking to you."
+
+ROUTER = IntentRouter()
+
+
+class GameError(Exception):
+    """An action the rules don't allow right now (game over, accusation still locked)."""
+
+
+def rank(score):
+    if score > 1200:
+        return "Master Detective"
+    if score > 800:
+        return "Private Investigator"
+    return "Rookie"
+
+
+class GameSession:
+    def __init__(self, scenario, brain=None, start_turns=START_TURNS, start_score=START_SCORE):
+        """
+        scenario: the dict from load_scenario()/build_scenario().
+        brain: a DetectiveBrain or WorkerPool - only needed for ask().
+        """
+        self.scenario = scenario
+        self.brain = brain
+        # the suspect records (story, timeline, compiled index) are shared by all games,
+        # only a small SuspectState (willingness, last_match, questions) belongs to this one
+        self.suspects = new_game(scenario["suspects"])
+        self.start_turns = start_turns
+        self.turns_left = start_turns
+        self.score = start_score
+        self.outcome = None  # "success", "failure" or "timeout" once the game is over
+
+    # --- rules ---
+
+    @property
+    def can_accuse(self):
+        return self.turns_left <= self.start_turns - ACCUSE_AFTER
+
+    @property
+    def turns_until_unlock(self):
+        return max(0, self.turns_left - (self.start_turns - ACCUSE_AFTER))
+
+    def find_suspect(self, ref):
+        """Accepts the number from the suspect list (1-based) or (part of) the name."""
+        ref = str(ref).strip()
+        if not ref:
+            # "" is part of every name and would pick the first suspect
+            raise ValueError("No suspect given.")
+        if ref.isdigit():
+            idx = int(ref) - 1
+            if 0 <= idx < len(self.suspects):
+                return self.suspects[idx]
+            return None
+        for s in self.suspects:
+            if ref.lower() in s.name.lower():
+                return s
+        return None
+
+    def check_playing(self):
+        if self.outcome:
+            raise GameError(f"The game is over ({self.outcome}).")
+
+    # --- actions ---
+
+    def start_question(self, ref, text):
+        """
+        The rule half of ask(): spends the turn and handles insults, but doesn't answer.
+        Returns (suspect, intents, reply); reply["answer"] is None when the suspect still
+        talks and the brain has to answer (the server does that in its batch scheduler).
+        """
+        self.check_playing()
+        suspect = self.find_suspect(ref)
+        if suspect is None:
+            raise ValueError(f"Unknown suspect: {ref}")
+        text = str(text).strip()
+        if not text:
+            raise ValueError("Empty question.")
+
+        self.turns_left -= 1
+        self.score -= QUESTION_COST
+        suspect.state.questions[suspect.slot] += 1
+        notes = []
+
+        intents = ROUTER.scan(text)
+        offended = ROUTER.is_insult(intents)
+        if offended:
+            suspect.decrease_willingness(INSULT_WILLINGNESS)
+            self.score -= INSULT_COST
+            notes.append(f"{suspect.name} is offended by your language.")
+
+        refused = suspect.willingness <= 0
+        if self.turns_left <= 0:
+            self.outcome = "timeout"
+
+        reply = {
+            "suspect": suspect.name,
+            "answer": REFUSAL if refused else None,
+            "refused": refused,
+            "offended": offended,
+            "notes": notes,
+        }
+        return suspect, intents, reply
+
+    def finish_question(self, reply):
+        """Adds the state (and the timeout text if that was the last turn) to a reply."""
+        if self.outcome == "timeout":
+            reply["text"] = self.scenario["outcomes"].get("timeout")
+        reply.update(self.state())
+        return reply
+
+    def ask(self, ref, text):
+        """One question to one suspect. Raises ValueError for bad input, GameError after the end."""
+        suspect, intents, reply = self.start_question(ref, text)
+        if reply["answer"] is None:
+            reply["answer"] = self.brain.parse(text.strip(), suspect, intents)
+        return self.finish_question(reply)
+
+    def accuse(self, name):
+        """Names the killer. Ends the game either way."""
+        self.check_playing()
+        if not self.can_accuse:
+            raise GameError(f"You need to gather more evidence! Come back in {self.turns_until_unlock} turns.")
+
+        solution = self.scenario["meta"]["solution"]
+        outcomes = self.scenario["outcomes"]
+
+        if solution["killer"].lower() in str(name).lower():
+            self.score += SOLVED_BONUS
+            self.outcome = "success"
+            return dict(self.state(), text=outcomes.get("success"), rank=rank(self.score), motive=solution.get("motive"))
+
+        self.score -= WRONG_ACCUSATION_COST
+        self.outcome = "failure"
+        return dict(self.state(), text=outcomes.get("failure"))
+
+    def state(self):
+        return {
+            "turns_left": self.turns_left,
+            "score": self.score,
+            "can_accuse": self.can_accuse,
+            "outcome": self.outcome,
+            "suspects": [
+                {"number": i + 1, "name": s.name, "bio": s.bio, "willingness": s.willingness,
+                 "questions": s.state.questions[s.slot]}
+                for i, s in enumerate(self.suspects)
+            ],
+        }
@@ -1,31 +1,54 @@
 import os
 import json
-from google import genai
-from google.genai import types
+import re
+import sqlite3
+import time
 
-import os
-from dotenv import load_dotenv, set_key
+from .json_stream import MYSTERY_PREVIEW, IncompleteJSON, parse_stream, salvage
+from .library import ScenarioLibrary
+from .validator import broken_parts, repair_locally, validate
+
+# google.genai and python-dotenv are only imported when a mystery is really
+# generated, so playing an existing mystery starts without them (and without
+# any question about the key).
 
 # Define the .env file path
 env_file = ".env"
-load_dotenv(env_file)
 
-API_KEY = os.getenv("GEMINI_API_KEY")
+API_KEY = None  # filled in by get_api_key()
+key_prompted = False
 
-# If the key is missing, ask the user for it
-if not API_KEY:
-    print("\n⚠️  No API Key found. To generate new mysteries, you need a Google Gemini Key.")
-    print("   (Get one for free at: https://aistudio.google.com/app/apikey)")
-    user_key = input("👉 Please paste your API Key here (or press Enter for Offline Mode): ").strip()
-    
-    if user_key:
-        # Create the .env file and save the key
-        with open(env_file, "w") as f:
-            f.write(f"GEMINI_API_KEY={user_key}")
-        print("✅ Key saved! Restarting configuration...")
-        API_KEY = user_key
-    else:
-        print("running in OFFLINE mode.")
+
+def get_api_key(ask=True):
+    """
+    The Gemini key from the environment or the .env file.
+    If it's missing and ask=True, the player is asked for it (once per run).
+    Returns None in offline mode.
+    """
+    global API_KEY, key_prompted
+    if API_KEY:
+        return API_KEY
+
+    from dotenv import load_dotenv
+    load_dotenv(env_file)
+    API_KEY = os.getenv("GEMINI_API_KEY")
+
+    # If the key is missing, ask the user for it
+    if not API_KEY and ask and not key_prompted:
+        key_prompted = True
+        print("\n⚠️  No API Key found. To generate new mysteries, you need a Google Gemini Key.")
+        print("   (Get one for free at: https://aistudio.google.com/app/apikey)")
+        user_key = input("👉 Please paste your API Key here (or press Enter for Offline Mode): ").strip()
+
+        if user_key:
+            # Create the .env file and save the key
+            with open(env_file, "w") as f:
+                f.write(f"GEMINI_API_KEY={user_key}")
+            print("✅ Key saved! Restarting configuration...")
+            API_KEY = user_key
+        else:
+            print("running in OFFLINE mode.")
+    return API_KEY
 
 
 OUTPUT_FILE = "data/scenario_generated.json"
@@ -93,68 +116,263 @@ THE JSON STRUCTURE MUST MATCH THIS EXACTLY:
 }
 """
 
-import time
+class QuotaExceeded(Exception):
+    """Raised instead of sleeping when the API says we hit the rate limit (429); retry_after is in seconds."""
+    def __init__(self, message, retry_after=60):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+def quota_retry_after(error_msg, default=60):
+    """Reads the suggested wait (e.g. 'retryDelay': '37s') from a 429 error."""
+    match = re.search(r"retry_?delay\W+(\d+)", error_msg, re.IGNORECASE)
+    return int(match.group(1)) if match else default
+
+# the part of the mystery to ask for again, described for the AI
+PART_NAMES = {
+    "meta": "meta (an object with title, intro_text and solution)",
+    "outcomes": "outcomes (an object with success, failure and timeout)",
+    "solution": "meta.solution (an object with killer and motive; the killer must be the full name of one of the suspects)",
+    "suspect": "suspects[{i}] (ONE suspect object)",
+}
+
+PART_PROMPT = """
+THE CURRENT MYSTERY (one part of it is broken):
+{mystery}
+
+BROKEN PART: {where}
+PROBLEMS: {problems}
+
+Return ONLY the JSON for {where} - not the whole mystery - in exactly the
+format of the JSON structure above, consistent with the rest of the story.
+"""
+
+def count_tokens(usage, prompt, chars):
+    """Tokens of one call, as reported by the API (estimated as ~4 characters per token otherwise)."""
+    total = getattr(usage, "total_token_count", None) if usage is not None else None
+    return total or (len(prompt) + chars) // 4
+
+def load_json(text):
+    """json.loads, but a cut-off answer still gives back the parts that were complete."""
+    try:
+        return json.loads(text)
+    except ValueError:
+        data = salvage(text)
+        if data is None:
+            raise
+        return data
+
+def json_config():
+    """Request settings for a JSON answer (google.genai is only imported here, when it's needed)."""
+    from google.genai import types
+    return types.GenerateContentConfig(response_mime_type="application/json")
+
+def request_mystery(client, model_name, theme, on_value=None):
+    """
+    One API call. Without 'on_value' it waits for the whole response.
+    With 'on_value' the response is streamed, and on_value(path, value) is called
+    for the title, the intro and every suspect as soon as each one is complete.
+    Returns (data, stats): the timings (first content / total seconds), model and tokens.
+    """
+    request = dict(
+        model=model_name,
+        contents=f"{SYSTEM_PROMPT}\n\nTHEME REQUEST: {theme}",
+        config=json_config()
+    )
+    start = time.perf_counter()
+
+    if on_value is None:
+        response = client.models.generate_content(**request)
+        usage = getattr(response, "usage_metadata", None)
+        data = load_json(response.text)
+        total_s = time.perf_counter() - start
+        stats = {"first_content_s": total_s, "total_s": total_s, "chars": len(response.text)}
+    else:
+        chunks = client.models.generate_content_stream(**request)
+        usage = None
+        def texts():
+            nonlocal usage
+            for chunk in chunks:
+                usage = getattr(chunk, "usage_metadata", None) or usage  # the last chunk has the totals
+                yield chunk.text or ""
+        try:
+            data, stats = parse_stream(texts(), MYSTERY_PREVIEW, on_value, start)
+        except IncompleteJSON as e:
+            data = load_json(e.text)
+            total_s = time.perf_counter() - start
+            stats = {"first_content_s": total_s, "total_s": total_s, "chars": len(e.text)}
+
+    stats = dict(stats, model=model_name, streamed=on_value is not None)
+    stats["tokens"] = count_tokens(usage, request["contents"], stats["chars"])
+    return data, stats
+
+def describe_part(part):
+    if part[0] == "suspects":
+        return PART_NAMES["suspect"].format(i=part[1])
+    if part == ("meta", "solution"):
+        return PART_NAMES["solution"]
+    return PART_NAMES[part[0]]
+
+def set_part(data, part, value):
+    if part[0] == "suspects":
+        if not isinstance(data.get("suspects"), list):
+            data["suspects"] = []
+        while len(data["suspects"]) <= part[1]:
+            data["suspects"].append(None)
+        data["suspects"][part[1]] = value
+    elif part == ("meta", "solution"):
+        if not isinstance(data.get("meta"), dict):
+            data["meta"] = {}
+        data["meta"]["solution"] = value
+    else:
+        data[part[0]] = value
+
+def request_part(client, model_name, data, part, problems):
+    """Asks the AI again for ONE broken part of the mystery (e.g. one suspect). Returns (value, seconds, tokens)."""
+    where = describe_part(part)
+    contents = SYSTEM_PROMPT + PART_PROMPT.format(
+        mystery=json.dumps(data, indent=1),
+        where=where,
+        problems="; ".join(p.message for p in problems if p.part == part),
+    )
+    start = time.perf_counter()
+    response = client.models.generate_content(
+        model=model_name,
+        contents=contents,
+        config=json_config()
+    )
+    value = json.loads(response.text)
+    if part[0] == "suspects" and isinstance(value, list) and len(value) == 1:
+        value = value[0]
+    tokens = count_tokens(getattr(response, "usage_metadata", None), contents, len(response.text))
+    return value, time.perf_counter() - start, tokens
+
+def repair_mystery(client, model_name, data, log=print, max_requests=4, generation=None):
+    """
+    Validates a fresh mystery and repairs it instead of throwing it away:
+    trivial mistakes are fixed locally, and only the broken parts are asked for again.
+    'generation' are the stats of the request that wrote it (to compare the cost).
+    Returns (the playable mystery or None if it could not be repaired, what the repair did).
+    """
+    generation = generation or {}
+    if not isinstance(data, dict):
+        return None, {}
 
-def generate_mystery(theme: str):
+    fixed = repair_locally(data)
+    regenerated = []
+    seconds = 0.0
+    tokens = 0
+
+    problems = validate(data)
+    while problems and len(regenerated) < max_requests:
+        part = broken_parts(problems)[0]
+        if part == ():
+            break  # nothing to keep
+        log(f"   🔧 Asking again for {describe_part(part)} only...")
+        try:
+            value, part_s, part_tokens = request_part(client, model_name, data, part, problems)
+        except Exception as e:
+            log(f"   ❌  Repair failed: {e}")
+            break
+        set_part(data, part, value)
+        regenerated.append("/".join(str(p) for p in part))
+        seconds += part_s
+        tokens += part_tokens
+        fixed += repair_locally(data)
+        problems = validate(data)
+
+    if problems:
+        log(f"   ❌  The mystery is still broken: {problems}")
+        return None, {}
+    if not fixed and not regenerated:
+        return data, {}
+
+    # compared with the alternative: generating the whole mystery again
+    repair = dict(
+        fixed_locally=fixed,
+        regenerated=regenerated,
+        repair_s=round(seconds, 2),
+        repair_tokens=tokens,
+        seconds_saved=round(generation.get("total_s", 0.0) - seconds, 2),
+        tokens_saved=generation.get("tokens", 0) - tokens,
+    )
+    log(f"   🔧 Repaired the mystery: {len(fixed)} fixed locally, {len(regenerated)} part(s) asked for again.")
+    log(f"   💰 Saved ~{repair['tokens_saved']} tokens and {repair['seconds_saved']:.1f}s compared with a full regeneration.")
+    return data, repair
+
+def generate_mystery(theme: str, ask_key=True, log=print, on_value=None):
     """
     Calls Gemini API to generate the JSON content.
+    A quota error raises QuotaExceeded right away (never sleeps), so the caller
+    decides: the menu tells the player, the background pool pauses its refills.
+    With ask_key=False a missing API key is not asked for (background pool).
+    With on_value the answer is streamed (see request_mystery).
+    Returns (data, stats), data is None if nothing playable came back. The stats
+    (timings, tokens, stats["repair"]) belong to THIS call, even while the
+    background pool generates at the same time.
     """
-    print(f"🕵️  Asking the AI to write a mystery about: '{theme}'...")
-    print("⏳  This may take 10-20 seconds...")
+    api_key = get_api_key(ask=ask_key)
+    if not api_key:
+        log("❌ No API key: running in OFFLINE mode, no new mystery.")
+        return None, {}
 
-    client = genai.Client(api_key=API_KEY)
+    from google import genai
+
+    log(f"🕵️  Asking the AI to write a mystery about: '{theme}'...")
+    log("⏳  This may take 10-20 seconds...")
+
+    client = genai.Client(api_key=api_key)
     
     models_to_try = ["gemini-2.5-flash", "gemini-2.0-flash-001"]
     
     for model_name in models_to_try:
         try:
-            print(f"   ... Attempting with model: {model_name}")
-            response = client.models.generate_content(
-                model=model_name,
-                contents=f"{SYSTEM_PROMPT}\n\nTHEME REQUEST: {theme}",
-                config=types.GenerateContentConfig(
-                    response_mime_type="application/json"
-                )
-            )
-            return json.loads(response.text)
+            log(f"   ... Attempting with model: {model_name}")
+            data, stats = request_mystery(client, model_name, theme, on_value)
+            data, stats["repair"] = repair_mystery(client, model_name, data, log, generation=stats)
+            return data, stats
 
         except Exception as e:
             error_msg = str(e)
             if "429" in error_msg or "RESOURCE_EXHAUSTED" in error_msg:
-                print("   ⚠️  Model is busy (Quota Limit). Waiting 60 seconds to retry...")
-                time.sleep(60)
-                # Try one more time with the same model
-                try:
-                    response = client.models.generate_content(
-                        model=model_name,
-                        contents=f"{SYSTEM_PROMPT}\n\nTHEME REQUEST: {theme}",
-                        config=types.GenerateContentConfig(
-                            response_mime_type="application/json"
-                        )
-                    )
-                    return json.loads(response.text)
-                except:
-                    print(f"   ❌  Retry failed. Moving to next model...")
-                    continue
+                raise QuotaExceeded(error_msg, quota_retry_after(error_msg))
             elif "404" in error_msg:
-                 print(f"   ❌  Model {model_name} not found. Trying next...")
+                 log(f"   ❌  Model {model_name} not found. Trying next...")
                  continue
             else:
-                print(f"\n❌ Unexpected Error: {e}")
-                return None
+                log(f"\n❌ Unexpected Error: {e}")
+                return None, {}
     
-    return None
+    return None, {}
 
-def save_scenario(data):
+def save_scenario(data, theme=None):
     if not data:
         print("❌ Error: No data to save.")
         return False
+
+    problems = validate(data)
+    if problems:
+        print("❌ Error: This mystery is not playable:")
+        for problem in problems:
+            print(f"   - {problem}")
+        return False
     
     # Ensure data directory exists
     os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
     
     with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2)
+
+    # the compiled version of the old mystery is outdated now
+    from .scenario_cache import remove_compiled
+    remove_compiled(OUTPUT_FILE)
+
+    # keep every mystery in the library, so it can be played again later
+    try:
+        library = ScenarioLibrary()
+        library.add(data, theme)
+        library.close()
+    except sqlite3.Error as e:
+        print(f"⚠️ Could not add the mystery to the library: {e}")
     
     print(f"\n✅ SUCCESS! New mystery saved to: {OUTPUT_FILE}")
     print(f"📜 Title: \"{data['meta']['title']}\"")
@@ -0,0 +1,45 @@
+"""
+One pass over the question finds every keyword the game reacts to
+(insults, "you", "who", "killer"). main.py and DetectiveBrain share the result,
+instead of each lowercasing the question and searching it word by word again.
+
+The keywords are matched as substrings of the lowercased text, exactly like the
+old checks ("you" also matches "your", "shit" also matches "bullshit"),
+so the answers don't change.
+
+Not in here: the greeting check (first token of the parsed question), the
+accusation words (token lemmas) and the time (DetectiveBrain.get_time regex).
+They read spaCy's tokens or need a pattern, not a plain substring.
+"""
+import re
+
+INSULTS = ("idiot", "stupid", "dumb", "liar", "shut up", "ugly", "crazy", "fuck", "shit")
+
+# words DetectiveBrain.decide looks for ("did you" is covered by "you")
+KEYWORDS = ("you", "who", "killer")
+
+
+class IntentRouter:
+    def __init__(self, insults=INSULTS, keywords=KEYWORDS):
+        self.insults = frozenset(insults)
+        self.keywords = tuple(sorted(self.insults | set(keywords)))
+
+        # one regex for all keywords. The lookahead doesn't consume the text, so
+        # overlapping words ("crazyou") are all found. Longest words come first, so
+        # at each position the longest keyword matches; the shorter keywords that
+        # start there are its prefixes and are added from 'prefixes'.
+        longest_first = sorted(self.keywords, key=len, reverse=True)
+        self.pattern = re.compile("(?=(" + "|".join(map(re.escape, longest_first)) + "))")
+        self.prefixes = {
+            word: frozenset(k for k in self.keywords if word.startswith(k)) for word in self.keywords
+        }
+
+    def scan(self, text):
+        """The set of keywords contained in the text (one pass over the lowercased text)."""
+        found = set()
+        for match in self.pattern.finditer(text.lower()):
+            found |= self.prefixes[match.group(1)]
+        return frozenset(found)
+
+    def is_insult(self, found):
+        return not self.insults.isdisjoint(found)
@@ -0,0 +1,192 @@
+"""
+Incremental JSON parsing for streamed model output.
+
+The mystery JSON arrives in small text chunks. StreamingJSON reads them as they
+come and reports every watched value (e.g. meta.title or one whole suspect) the
+moment its closing quote / bracket arrives, long before the full document is done.
+"""
+import json
+import time
+
+ANY = "*"  # wildcard in a watched path, e.g. ("suspects", ANY)
+
+# parts of a mystery that can be shown while the rest is still being written
+# (the solution is left out on purpose)
+MYSTERY_PREVIEW = [("meta", "title"), ("meta", "intro_text"), ("suspects", ANY)]
+
+
+class IncompleteJSON(ValueError):
+    """The text ended (or broke) before the document was complete. Keeps the text for salvage()."""
+    def __init__(self, message, text):
+        super().__init__(message)
+        self.text = text
+
+
+class StreamingJSON:
+    """
+    feed(chunk) returns a list of (path, value) for the watched values that
+    became complete in that chunk. A path is a tuple of keys / list indexes,
+    e.g. ("meta", "title") or ("suspects", 0). The root document is path ().
+    Text before the first "{" (like a stray ```json) is skipped.
+    """
+    def __init__(self, watch=()):
+        self.watch = [tuple(p) for p in watch]
+        self.text = ""
+        self.pos = 0
+
+        # open containers: [kind, current key / index, start offset, expecting a key, own path]
+        self.stack = []
+        self.started = False
+        self.done = False
+        self.value = None      # the whole document, once complete
+
+        self.in_string = False
+        self.escape = False
+        self.string_start = 0
+        self.scalar_start = None
+
+    def is_watched(self, path):
+        for pattern in self.watch:
+            if len(pattern) == len(path) and all(p == ANY or p == k for p, k in zip(pattern, path)):
+                return True
+        return False
+
+    def path(self):
+        return tuple(frame[1] for frame in self.stack)
+
+    def feed(self, chunk):
+        self.text += chunk
+        events = []
+        text = self.text
+        i = self.pos
+
+        while i < len(text) and not self.done:
+            c = text[i]
+
+            # --- inside a string ---
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif c == "\\":
+                    self.escape = True
+                elif c == '"':
+                    self.in_string = False
+                    top = self.stack[-1]
+                    if top[0] == "obj" and top[3]:
+                        top[1] = json.loads(text[self.string_start:i + 1])  # a key
+                    else:
+                        self.complete(self.string_start, i + 1, events)
+                i += 1
+                continue
+
+            # --- inside a number / true / false / null ---
+            if self.scalar_start is not None:
+                if c not in " \t\r\n,]}":
+                    i += 1
+                    continue
+                self.complete(self.scalar_start, i, events)
+                self.scalar_start = None
+
+            if not self.started:
+                if c == "{":
+                    self.started = True
+                    self.stack.append(["obj", None, i, True, ()])
+                i += 1
+                continue
+
+            if c == "{" or c == "[":
+                kind = "obj" if c == "{" else "arr"
+                self.stack.append([kind, None if kind == "obj" else 0, i, kind == "obj", self.path()])
+            elif c == "}" or c == "]":
+                frame = self.stack.pop()
+                self.emit(frame[4], frame[2], i + 1, events)
+                if not self.stack:
+                    self.done = True
+            elif c == '"':
+                self.in_string = True
+                self.string_start = i
+            elif c == ":":
+                self.stack[-1][3] = False
+            elif c == ",":
+                top = self.stack[-1]
+                if top[0] == "obj":
+                    top[3] = True
+                else:
+                    top[1] += 1
+            elif c not in " \t\r\n":
+                self.scalar_start = i
+            i += 1
+
+        self.pos = i
+        return events
+
+    def complete(self, start, end, events):
+        """A string or scalar value inside the current container is finished."""
+        self.emit(self.path(), start, end, events)
+
+    def emit(self, path, start, end, events):
+        if path == ():
+            self.value = json.loads(self.text[start:end])
+            if self.is_watched(path):
+                events.append((path, self.value))
+        elif self.is_watched(path):
+            events.append((path, json.loads(self.text[start:end])))
+
+
+def parse_stream(chunks, watch=(), on_value=None, start=None):
+    """
+    Reads an iterable of text chunks to the end.
+    Calls on_value(path, value) for every watched value as soon as it is complete.
+    Returns (document, stats) where stats has the time to the first watched
+    value and the total time in seconds (counted from 'start', default: now).
+    """
+    parser = StreamingJSON(watch)
+    if start is None:
+        start = time.perf_counter()
+    first_value_s = None
+
+    for chunk in chunks:
+        for path, value in parser.feed(chunk):
+            if first_value_s is None:
+                first_value_s = time.perf_counter() - start
+            if on_value:
+                on_value(path, value)
+
+    total_s = time.perf_counter() - start
+    if parser.value is None:
+        raise IncompleteJSON("stream ended before the JSON document was complete", parser.text)
+    return parser.value, {"first_content_s": first_value_s, "total_s": total_s, "chars": len(parser.text)}
+
+
+def salvage(text, sections=("meta", "outcomes", "suspects")):
+    """
+    Rebuilds whatever top-level sections of a cut-off / broken document were
+    complete. Lists are kept item by item, e.g. the first 2 of 3 suspects.
+    Returns None if nothing could be saved.
+    """
+    watch = [(name,) for name in sections] + [(name, ANY) for name in sections]
+    parser = StreamingJSON(watch)
+    try:
+        events = parser.feed(text)
+    except (ValueError, IndexError):
+        return None
+    if parser.value is not None:
+        return parser.value
+
+    data = {}
+    for path, value in events:
+        if len(path) == 1:
+            data[path[0]] = value
+        elif isinstance(path[1], int):
+            data.setdefault(path[0], [])
+            if isinstance(data[path[0]], list):
+                data[path[0]].append(value)
+    return data or None
+
+
+def fake_stream(text, chunk_size=32, delay=0.0):
+    """Replays a finished response in chunks, like the API would (for tests and benchmarks)."""
+    for i in range(0, len(text), chunk_size):
+        if delay:
+            time.sleep(delay)
+        yield text[i:i + chunk_size]
@@ -0,0 +1,54 @@
+import numpy as np
+
+
+class LemmaIndex:
+    """
+    Inverted index for a whole scenario:
+    lemma -> posting list of (suspect slot, sentence ids).
+
+    Synonym expansion is done here ONCE when the index is built, so a question
+    only needs a few dictionary lookups to know which sentences match.
+    """
+    def __init__(self, story_indexes, synonyms):
+        # --- posting lists: lemma -> {suspect slot: array of sentence ids} ---
+        postings = {}
+        for slot, story in enumerate(story_indexes):
+            for sent_id, sent_lemmas in enumerate(story.lemmas):
+                for lemma in sent_lemmas:
+                    postings.setdefault(lemma, {}).setdefault(slot, []).append(sent_id)
+
+        self.postings = {
+            lemma: {slot: np.array(ids, dtype="int32") for slot, ids in by_slot.items()}
+            for lemma, by_slot in postings.items()
+        }
+
+        # --- synonyms folded in: question lemma -> terms that can actually match ---
+        # words that appear in no story are dropped here, so they are never looked up again
+        self.expansions = {}
+        for lemma, words in synonyms.items():
+            terms = [w for w in [lemma] + list(words) if w in self.postings]
+            self.expansions[lemma] = frozenset(terms)
+
+        for slot, story in enumerate(story_indexes):
+            story.lemma_index = self
+            story.slot = slot
+
+    def search_terms(self, q_lemmas):
+        """Expands the question lemmas with their synonyms (duplicates are removed)."""
+        terms = set()
+        for lemma in q_lemmas:
+            expansion = self.expansions.get(lemma)
+            if expansion is not None:
+                terms |= expansion
+            elif lemma in self.postings:
+                terms.add(lemma)
+        return terms
+
+    def match_counts(self, q_lemmas, slot, n_sentences):
+        """Counts, for every sentence of one suspect, how many search terms it contains."""
+        counts = np.zeros(n_sentences)
+        for term in self.search_terms(q_lemmas):
+            rows = self.postings[term].get(slot)
+            if rows is not None:
+                counts[rows] += 1
+        return counts
@@ -0,0 +1,99 @@
+"""
+Library of every generated mystery, stored in one SQLite file (data/library.db).
+
+The metadata (title, theme, date, number of suspects, content hash) lives in its
+own columns, so the menu can list hundreds of cases without parsing any JSON.
+The full scenario is only read and parsed when one is picked (get(id)).
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+LIBRARY_FILE = "data/library.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenarios (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    theme TEXT,
+    created REAL NOT NULL,
+    suspect_count INTEGER NOT NULL,
+    content_hash TEXT NOT NULL UNIQUE,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scenarios_created ON scenarios (created);
+"""
+
+META_COLUMNS = "id, title, theme, created, suspect_count, content_hash"
+
+
+def content_hash(data):
+    """Same mystery -> same hash, no matter how the JSON was formatted."""
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ScenarioLibrary:
+    def __init__(self, path=LIBRARY_FILE):
+        self.path = path
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+
+    def add(self, data, theme=None):
+        """Stores a mystery and returns its id (the existing id if it is already in the library)."""
+        digest = content_hash(data)
+        with self.db:
+            self.db.execute(
+                "INSERT OR IGNORE INTO scenarios (title, theme, created, suspect_count, content_hash, body) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    data.get("meta", {}).get("title", "Untitled Mystery"),
+                    theme,
+                    time.time(),
+                    len(data.get("suspects", [])),
+                    digest,
+                    json.dumps(data),
+                ),
+            )
+        row = self.db.execute("SELECT id FROM scenarios WHERE content_hash = ?", (digest,)).fetchone()
+        return row["id"]
+
+    def import_file(self, filename, theme=None):
+        """Adds an existing scenario JSON file (e.g. the old scenario_generated.json)."""
+        try:
+            with open(filename, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return self.add(data, theme)
+
+    def list(self, limit=None, offset=0):
+        """Metadata of the stored mysteries, newest first (the JSON bodies are not read)."""
+        query = f"SELECT {META_COLUMNS} FROM scenarios ORDER BY created DESC, id DESC LIMIT ? OFFSET ?"
+        rows = self.db.execute(query, (-1 if limit is None else limit, offset))
+        return [dict(row) for row in rows]
+
+    def info(self, scenario_id):
+        row = self.db.execute(f"SELECT {META_COLUMNS} FROM scenarios WHERE id = ?", (scenario_id,)).fetchone()
+        return dict(row) if row else None
+
+    def get(self, scenario_id):
+        """The full scenario dict of one mystery (None if the id is unknown)."""
+        row = self.db.execute("SELECT body FROM scenarios WHERE id = ?", (scenario_id,)).fetchone()
+        return json.loads(row["body"]) if row else None
+
+    def remove(self, scenario_id):
+        with self.db:
+            self.db.execute("DELETE FROM scenarios WHERE id = ?", (scenario_id,))
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM scenarios").fetchone()[0]
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,120 @@
+"""
+Opt-in timing of the stages inside DetectiveBrain.parse:
+tokenize -> time -> greeting -> accusation -> story
+
+When disabled (the default) parse() only gets a do-nothing stopwatch,
+so the cost is a handful of empty method calls per question.
+"""
+import json
+import time
+
+STAGES = ("tokenize", "time", "greeting", "accusation", "story")
+
+# histogram buckets in seconds (50 microseconds ... 250 milliseconds)
+BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # last one is "+Inf"
+        self.total = 0.0
+        self.n = 0
+
+    def observe(self, seconds):
+        i = 0
+        while i < len(BUCKETS) and seconds > BUCKETS[i]:
+            i += 1
+        self.counts[i] += 1
+        self.total += seconds
+        self.n += 1
+
+    def to_dict(self):
+        return {
+            "count": self.n,
+            "sum_s": round(self.total, 6),
+            "avg_ms": round(self.total / self.n * 1000, 4) if self.n else 0.0,
+            "buckets": {str(le): c for le, c in zip(BUCKETS + ("+Inf",), self.counts)},
+        }
+
+
+class Stopwatch:
+    """Measures the stages of ONE parse() call."""
+    def __init__(self, metrics):
+        self.metrics = metrics
+        self.last = time.perf_counter()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        self.metrics.observe(stage, now - self.last)
+        self.last = now
+
+    def done(self, branch, answer):
+        self.metrics.count(branch)
+        return answer
+
+
+class NullStopwatch:
+    """Used when metrics are off: does nothing."""
+    def lap(self, stage):
+        pass
+
+    def done(self, branch, answer):
+        return answer
+
+
+NULL_STOPWATCH = NullStopwatch()
+
+
+class ParseMetrics:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.reset()
+
+    def reset(self):
+        self.stages = {stage: Histogram() for stage in STAGES}
+        self.branches = {}
+
+    def start(self):
+        """Returns the stopwatch for one parse() call."""
+        if not self.enabled:
+            return NULL_STOPWATCH
+        return Stopwatch(self)
+
+    def observe(self, stage, seconds):
+        if self.enabled:
+            self.stages[stage].observe(seconds)
+
+    def count(self, branch):
+        self.branches[branch] = self.branches.get(branch, 0) + 1
+
+    # --- export ---
+
+    def to_dict(self):
+        return {
+            "enabled": self.enabled,
+            "stages": {stage: h.to_dict() for stage, h in self.stages.items()},
+            "branches": dict(self.branches),
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self):
+        """Prometheus text exposition format."""
+        lines = [
+            "# HELP detective_parse_stage_seconds Time spent in each stage of DetectiveBrain.parse.",
+            "# TYPE detective_parse_stage_seconds histogram",
+        ]
+        for stage, h in self.stages.items():
+            cumulative = 0
+            for le, c in zip(BUCKETS + ("+Inf",), h.counts):
+                cumulative += c
+                lines.append(f'detective_parse_stage_seconds_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+            lines.append(f'detective_parse_stage_seconds_sum{{stage="{stage}"}} {h.total:.6f}')
+            lines.append(f'detective_parse_stage_seconds_count{{stage="{stage}"}} {h.n}')
+
+        lines.append("# HELP detective_parse_answers_total Which branch of parse() produced the answer.")
+        lines.append("# TYPE detective_parse_answers_total counter")
+        for branch, n in sorted(self.branches.items()):
+            lines.append(f'detective_parse_answers_total{{branch="{branch}"}} {n}')
+        return "\n".join(lines) + "\n"
@@ -1,31 +1,110 @@
-class KnowledgeBase:
-    def __init__(self):
-        self.facts = {}
+from array import array
+from types import MappingProxyType
+
+MAX_WILLINGNESS = 100
+
+RECORD_FIELDS = (
+    "id", "name", "bio", "personality_style", "story_text", "timeline",
+    "prefixes", "suffixes", "defense_statement", "fallback_statement", "is_guilty",
+)
+
+
+class SuspectRecord:
+    """
+    The scenario data of one suspect. Built once per scenario and shared by every
+    game, so it can't be changed - except story_index, which DetectiveBrain fills
+    in when it compiles the scenario.
+    """
+    __slots__ = RECORD_FIELDS + ("story_index",)
+
+    def __init__(self, id, name, bio, personality_style, story_text, timeline, prefixes, suffixes, defense_statement, fallback_statement, is_guilty=False):
+        values = (id, name, bio, personality_style, story_text, MappingProxyType(dict(timeline)),
+                  tuple(prefixes), tuple(suffixes), defense_statement, fallback_statement, is_guilty)
+        for field, value in zip(RECORD_FIELDS, values):
+            object.__setattr__(self, field, value)
+        object.__setattr__(self, "story_index", None)
+
+    def __setattr__(self, name, value):
+        if name != "story_index":
+            raise AttributeError(f"SuspectRecord is read-only ({name})")
+        object.__setattr__(self, name, value)
+
+    def __repr__(self):
+        return f"<SuspectRecord: {self.name}>"
+
+
+class SuspectState:
+    """
+    The game state of all suspects of ONE game, in small arrays
+    (slot i = suspect i): willingness, last matched answer and questions asked.
+    """
+    __slots__ = ("willingness", "last_match", "questions")
+
+    def __init__(self, n):
+        self.willingness = array("b", [MAX_WILLINGNESS]) * n
+        self.last_match = [None] * n  # the story sentence or "greeting" (shared strings, no copies)
+        self.questions = array("H", [0]) * n
+
 
 class Suspect:
-    def __init__(self, id, name, bio, personality_style, knowledge, story_text, timeline, prefixes, suffixes, defense_statement, fallback_statement, is_guilty=False):
-        self.id = id
-        self.name = name
-        self.bio = bio
-        self.personality_style = personality_style
-        self.knowledge = knowledge
-        self.story_text = story_text
-        self.timeline = timeline
-        self.prefixes = prefixes
-        self.suffixes = suffixes
-        self.defense_statement = defense_statement
-        self.fallback_statement = fallback_statement
-        self.is_guilty = is_guilty
-        
-        # Game State
-        self.last_match = None
-        self.willingness = 100  # Starts at 100%
+    """
+    What the game and DetectiveBrain work with: a view of one shared record
+    plus its slot in a game's SuspectState.
+    """
+    __slots__ = ("record", "state", "slot")
+
+    def __init__(self, record, state=None, slot=0):
+        self.record = record
+        self.state = state if state is not None else SuspectState(1)
+        self.slot = slot
+
+    def __getattr__(self, name):
+        # only called for names that aren't slots/properties: the scenario data
+        if name.startswith("__") or name in Suspect.__slots__:
+            raise AttributeError(name)
+        return getattr(self.record, name)
+
+    @property
+    def story_index(self):
+        return self.record.story_index
+
+    @story_index.setter
+    def story_index(self, index):
+        self.record.story_index = index
+
+    @property
+    def willingness(self):
+        return self.state.willingness[self.slot]
+
+    @willingness.setter
+    def willingness(self, value):
+        self.state.willingness[self.slot] = value
+
+    @property
+    def last_match(self):
+        return self.state.last_match[self.slot]
+
+    @last_match.setter
+    def last_match(self, value):
+        self.state.last_match[self.slot] = value
 
     def decrease_willingness(self, amount):
         """Reduces willingness score, clamping it at 0."""
-        self.willingness -= amount
-        if self.willingness < 0:
-            self.willingness = 0
+        self.willingness = max(0, self.willingness - amount)
+
+    def __copy__(self):
+        """A suspect for another player: same record, its own copy of the state."""
+        twin = Suspect(self.record)
+        twin.willingness = self.willingness
+        twin.last_match = self.last_match
+        twin.state.questions[0] = self.state.questions[self.slot]
+        return twin
 
     def __repr__(self):
-        return f"<Suspect: {self.name}>"
\ No newline at end of file
+        return f"<Suspect: {self.name}>"
+
+
+def new_game(suspects):
+    """Suspects for a new game: the same shared records with a fresh SuspectState."""
+    state = SuspectState(len(suspects))
+    return [Suspect(s.record, state, i) for i, s in enumerate(suspects)]
@@ -1,26 +1,74 @@
-import spacy
 import random
 import re
+import time
 from .models import Suspect
+from .story_index import StoryIndex, unit_vector
+from .lemma_index import LemmaIndex
+from . import scenario_cache
+from .metrics import NULL_STOPWATCH, ParseMetrics
+from .answer_cache import AnswerCache
+from .intents import IntentRouter
+
+MODEL_NAME = "en_core_web_md"
+
+# --- pipeline profiles ---
+# A question only needs lemmas, is_stop/is_punct and vectors (tok2vec, tagger,
+# attribute_ruler, lemmatizer). Sentence boundaries (the parser) are only used
+# when a story is compiled, and nothing reads the entities.
+# "fast" never loads NER and skips the parser for questions; stories are still
+# split by the parser, so the sentences - and the answers - stay the same.
+# (Running the parser or not doesn't change what tok2vec gives the tagger.)
+PIPELINE_PROFILES = {
+    "full": {"exclude": [], "question_skip": []},
+    "fast": {"exclude": ["ner"], "question_skip": ["parser"]},
+}
+DEFAULT_PROFILE = "full"
+
+def load_pipeline(profile=DEFAULT_PROFILE):
+    """Loads the spaCy model with only the components the given profile needs."""
+    import spacy  # the slow import (~1s): only when a brain is really created
+    settings = PIPELINE_PROFILES[profile]
+    # Ensure you run: python -m spacy download en_core_web_md
+    try:
+        nlp = spacy.load(MODEL_NAME, exclude=settings["exclude"])
+    except OSError:
+        print(f"⚠️ Model not found. Downloading '{MODEL_NAME}'...")
+        from spacy.cli import download
+        download(MODEL_NAME)
+        nlp = spacy.load(MODEL_NAME, exclude=settings["exclude"])
+    return nlp
 
 class DetectiveBrain:
-    def __init__(self):
+    def __init__(self, profile=DEFAULT_PROFILE, cache_size=2048, cache_ttl=600.0, ann_min_sentences=10000, vectors="full"):
         print("Loading brain... please wait.")
-        # Ensure you run: python -m spacy download en_core_web_md
-        try:
-            self.nlp = spacy.load("en_core_web_md")
-        except OSError:
-            print("⚠️ Model not found. Downloading 'en_core_web_md'...")
-            from spacy.cli import download
-            download("en_core_web_md")
-            self.nlp = spacy.load("en_core_web_md")
+        self.profile = profile
+        self.nlp = load_pipeline(profile)
+        # components the questions don't need (stories still use the whole pipeline)
+        self.question_skip = PIPELINE_PROFILES[profile]["question_skip"]
+
+        # "int8"/"float16": shrink the word vectors to our vocabulary when the first
+        # scenario is compiled (see src/vectors.py); "full" keeps the model's table
+        self.vector_mode = vectors
+        self.vector_bytes = None  # (before, after) once compacted
+
+        # per-stage timers, off by default (brain.metrics.enabled = True to switch on)
+        self.metrics = ParseMetrics()
 
         self.threshold = 0.35 
 
-        self.greetings = ["hi", "hello", "hey", "greetings", "yo", "morning", "evening"]
+        # stories with at least this many sentences get an approximate index (0 = never)
+        self.ann_min_sentences = ann_min_sentences
+
+        self.greetings = {"hi", "hello", "hey", "greetings", "yo", "morning", "evening"}
+
+        # remembers what was decided for repeated questions (cache_size=0 switches it off)
+        self.cache = AnswerCache(cache_size, cache_ttl, keep_words=self.greetings) if cache_size else None
         
         # Words that trigger defensive mode
-        self.accusations = ["kill", "murder", "guilty", "arrest", "confess", "stab", "poison", "hurt", "harm", "shoot", "did you do it"]
+        self.accusations = {"kill", "murder", "guilty", "arrest", "confess", "stab", "poison", "hurt", "harm", "shoot", "did you do it"}
+
+        # finds insults / "you" / "who" / "killer" in one scan over the question
+        self.router = IntentRouter()
 
         # generic synonyms 
         self.synonyms = {
@@ -72,52 +120,220 @@ class DetectiveBrain:
         if "later" in text: return "22:00"
         return None
 
-    def parse(self, msg, suspect):
-        doc = self.nlp(msg.lower().strip())
-        
+    def parse(self, msg, suspect, intents=None):
+        """
+        Answers one question. 'intents' are the keywords already found by
+        self.router.scan(msg) (main.py scans for insults anyway); found here if not given.
+        """
+        watch = self.metrics.start()
+        if intents is None:
+            intents = self.router.scan(msg)
+
+        # same (or nearly the same) question to this suspect before? then skip spaCy
+        facts = self.cache_facts(msg, intents)
+        outcome = self.cache.get(suspect, msg, facts) if self.cache else None
+        if outcome is None:
+            doc = self.nlp(msg.lower().strip(), disable=self.question_skip)
+            watch.lap("tokenize")
+            outcome = self.decide(doc, msg, suspect, watch, intents)
+            if self.cache:
+                self.cache.put(suspect, msg, doc, outcome, facts)
+
+        return self.render(outcome, suspect, watch)
+
+    def parse_batch(self, requests, intents=None):
+        """
+        Answers many (msg, suspect) pairs at once.
+        All questions go through nlp.pipe together, the rule logic runs per question.
+        'intents' can hold the router result of each question (None = scan it here).
+        """
+        intents = intents or [None] * len(requests)
+        intents = [found if found is not None else self.router.scan(msg) for (msg, _), found in zip(requests, intents)]
+        facts = [self.cache_facts(msg, found) for (msg, _), found in zip(requests, intents)]
+        outcomes = [
+            self.cache.get(suspect, msg, f) if self.cache else None
+            for (msg, suspect), f in zip(requests, facts)
+        ]
+        todo = [i for i, outcome in enumerate(outcomes) if outcome is None]
+        # one stopwatch per question: render() counts the branch, cache hits included
+        watches = [self.metrics.start() for _ in requests]
+
+        texts = [requests[i][0].lower().strip() for i in todo]
+        start = time.perf_counter()
+        docs = list(self.nlp.pipe(texts, batch_size=max(1, len(texts)), disable=self.question_skip))
+        per_question = (time.perf_counter() - start) / max(1, len(docs))
+
+        for i, doc in zip(todo, docs):
+            msg, suspect = requests[i]
+            self.metrics.observe("tokenize", per_question)
+            watches[i] = self.metrics.start()  # the stages after the shared nlp.pipe call
+            outcomes[i] = self.decide(doc, msg, suspect, watches[i], intents[i])
+            if self.cache:
+                self.cache.put(suspect, msg, doc, outcomes[i], facts[i])
+
+        return [
+            self.render(outcome, suspect, watch)
+            for outcome, (_, suspect), watch in zip(outcomes, requests, watches)
+        ]
+
+    def cache_facts(self, msg, intents):
+        """
+        What decide() reads from the raw question instead of the parsed doc
+        (the time and the intent keywords). They are part of the cache key, so
+        "at 8.30" (time branch) and "at 830" (story branch) never share an answer.
+        """
+        return (self.get_time(msg), intents)
+
+    def decide(self, doc, msg, suspect, watch=NULL_STOPWATCH, intents=None):
+        """
+        Finds out WHAT to answer, without changing the suspect.
+        Returns (branch, text): ("time", timeline entry), ("greeting", None),
+        ("accusation", None), ("story", best sentence) or ("fallback", None).
+        The result only depends on the question and the scenario, so it can be cached.
+        """
         # 1. Check for time queries
         t = self.get_time(msg)
+        watch.lap("time")
         if t and t in suspect.timeline:
-            return self.build_response(suspect.timeline[t], suspect)
+            return ("time", suspect.timeline[t])
 
         # 2. Greetings
         if len(doc) > 0 and doc[0].text in self.greetings:
-             if suspect.last_match == "greeting":
-                 suspect.decrease_willingness(10)
-                 return f"(Annoyed) We have established that. Ask your questions."
-             
-             suspect.last_match = "greeting"
-             return f"({suspect.personality_style.replace('_', ' ')}) I am listening."
+             watch.lap("greeting")
+             return ("greeting", None)
+        watch.lap("greeting")
 
         # 3. Accusations
+        if intents is None:
+            intents = self.router.scan(msg)
+
+        # Only accuse if they say "you" (imply the listener is the subject),
+        # and "Who" usually asks for a third party, not an accusation of the listener
         accused = False
-        for token in doc:
-            if token.lemma_ in self.accusations:
-                # Only accuse if they say "you" or imply the listener is the subject
-                if "you" in msg.lower() or "did you" in msg.lower():
-                    accused = True
-        
-        if "killer" in msg.lower() and "you" in msg.lower():
-             accused = True
-             
-        # "Who" usually asks for a third party, not an accusation of the listener
-        if "who" in msg.lower():
-            accused = False
+        if "you" in intents and "who" not in intents:
+            accused = "killer" in intents or any(token.lemma_ in self.accusations for token in doc)
 
+        watch.lap("accusation")
         if accused:
-             return f"(Defensively) {suspect.defense_statement}"
+             return ("accusation", None)
 
         # 4. Check story
         if suspect.story_text:
-            return self.check_story(doc, suspect)
+            best_sent = self.best_sentence(doc, suspect)
+            watch.lap("story")
+            if best_sent:
+                return ("story", best_sent)
         
-        return f"({suspect.personality_style.replace('_', ' ')}) {suspect.fallback_statement}"
+        return ("fallback", None)
+
+    def render(self, outcome, suspect, watch=NULL_STOPWATCH):
+        """
+        Turns a decision into the suspect's answer. This is the stateful part:
+        annoyance about repeated questions, willingness and random decoration.
+        """
+        branch, text = outcome
+        style = suspect.personality_style.replace('_', ' ')
+
+        if branch == "time":
+            return watch.done("time", self.build_response(text, suspect))
+
+        if branch == "greeting":
+            if suspect.last_match == "greeting":
+                suspect.decrease_willingness(10)
+                return watch.done("greeting_repeat", f"(Annoyed) We have established that. Ask your questions.")
+
+            suspect.last_match = "greeting"
+            return watch.done("greeting", f"({style}) I am listening.")
+
+        if branch == "accusation":
+            return watch.done("accusation", f"(Defensively) {suspect.defense_statement}")
+
+        if branch == "story":
+            if text == getattr(suspect, "last_match", None):
+                annoyed_phrases = [
+                    "I already answered that!", 
+                    "Are you not listening? I am not repeating myself.", 
+                    "I told you already!", 
+                    "Do not waste my time with the same questions."
+                ]
+                return watch.done("story_repeat", f"(Annoyed) {random.choice(annoyed_phrases)}")
+
+            suspect.last_match = text
+            return watch.done("story", self.build_response(text, suspect))
+
+        return watch.done("fallback", f"({style}) {suspect.fallback_statement}")
+
+    def compile_suspect(self, suspect):
+        """
+        Parses the suspect's story once and stores the result on the suspect.
+        After this, best_sentence only needs to parse the question.
+        """
+        self.compact_vectors([suspect.story_text])
+        suspect.story_index = StoryIndex.from_doc(self.nlp(suspect.story_text))
+        LemmaIndex([suspect.story_index], self.synonyms)
+        self.build_ann([suspect.story_index])
+        return suspect.story_index
 
-    def check_story(self, doc, suspect):
+    def compile_scenario(self, suspects, source=None):
+        """
+        Compiles the story index of every suspect in a scenario,
+        with one shared lemma index (lemma -> suspects & sentences).
+        If 'source' (the scenario JSON path) is given, the result is cached in a
+        binary file next to it and loaded from there on the next start.
+        """
+        self.compact_vectors([s.story_text for s in suspects])
+
+        indexes = None
+        if source:
+            key = scenario_cache.cache_key(source, self.nlp)
+            path = scenario_cache.cache_path(source)
+            indexes = scenario_cache.load_compiled(path, key, len(suspects))
+
+        if indexes is None:
+            indexes = [StoryIndex.from_doc(self.nlp(s.story_text)) for s in suspects]
+            if source:
+                try:
+                    scenario_cache.save_compiled(path, key, indexes)
+                except OSError as e:
+                    print(f"⚠️ Could not write compiled scenario: {e}")
+
+        for suspect, index in zip(suspects, indexes):
+            suspect.story_index = index
+        self.build_ann(indexes)
+        return LemmaIndex(indexes, self.synonyms)
+
+    def compact_vectors(self, texts):
+        """
+        Switches to the compact vector table (only with vectors="int8"/"float16", and only once).
+        Keeps the words of 'texts', the question corpus and the brain's word lists;
+        stories compiled later can only use these (other words get the nearest one),
+        so with several scenarios call this with all their texts first.
+        """
+        if self.vector_mode == "full" or self.vector_bytes:
+            return
+        from .vectors import compact_vectors, corpus_questions
+        words = list(self.greetings) + list(self.accusations) + list(self.synonyms)
+        words += [w for values in self.synonyms.values() for w in values]
+        self.vector_bytes = compact_vectors(self.nlp, list(texts) + corpus_questions() + words, self.vector_mode)
+        if self.cache:
+            self.cache.clear()
+
+    def build_ann(self, indexes):
+        """Adds the approximate (LSH) index to the very big stories only."""
+        if not self.ann_min_sentences:
+            return
+        for index in indexes:
+            if len(index) >= self.ann_min_sentences:
+                index.build_ann()
+
+    def best_sentence(self, doc, suspect):
+        """The story sentence that answers the question best (None if nothing is good enough)."""
         best_sent = None
         best_score = 0.0
 
-        story = self.nlp(suspect.story_text)
+        index = getattr(suspect, "story_index", None)
+        if index is None:
+            index = self.compile_suspect(suspect)
         
         q_lemmas = []
         keep = ["i", "you", "he", "she", "who", "what", "where", "doing", "anyone", "else", "think", "kill", "killed"]
@@ -127,44 +343,17 @@ class DetectiveBrain:
                 if not t.is_punct:
                     q_lemmas.append(t.lemma_)
         
-        search_terms = set(q_lemmas)
-        for lemma in q_lemmas:
-            if lemma in self.synonyms:
-                search_terms.update(self.synonyms[lemma])
-
-        for sent in story.sents:
-            score = doc.similarity(sent)
-            s_lemmas = [t.lemma_ for t in sent]
-            matches = 0
-            
-            for term in search_terms:
-                if term in s_lemmas:
-                    matches += 1
-            
-            if matches > 0:
-                score += (matches * 3.0) 
-
-            if score > best_score:
-                best_score = score
-                best_sent = sent.text
-
-        last = getattr(suspect, "last_match", None)
+        if len(index):
+            # every sentence is scored at once, argmax keeps the first best one (like the old loop)
+            scores = index.scores(unit_vector(doc), q_lemmas)
+            best = int(scores.argmax())
+            if scores[best] > best_score:
+                best_score = float(scores[best])
+                best_sent = index.sentences[best]
 
         if best_score > self.threshold and best_sent:
-            
-            if best_sent == last:
-                annoyed_phrases = [
-                    "I already answered that!", 
-                    "Are you not listening? I am not repeating myself.", 
-                    "I told you already!", 
-                    "Do not waste my time with the same questions."
-                ]
-                return f"(Annoyed) {random.choice(annoyed_phrases)}"
-            
-            suspect.last_match = best_sent
-            return self.build_response(best_sent, suspect)
-        
-        return f"({suspect.personality_style.replace('_', ' ')}) {suspect.fallback_statement}"
+            return best_sent
+        return None
 
     def build_response(self, text, suspect):
         prefix = ""
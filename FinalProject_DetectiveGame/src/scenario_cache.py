@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+import struct
+import tempfile
+
+import numpy as np
+
+from .story_index import StoryIndex
+
+# --- file layout ---
+# MAGIC | header length (8 bytes) | JSON header | padding | float32 vector block
+# The vector block is memory-mapped on load, so nothing has to be parsed again.
+MAGIC = b"DETECTIVE-COMPILED-1\n"
+ALIGN = 16
+
+
+def cache_path(json_path):
+    """The compiled artifact lives right next to the scenario JSON."""
+    return os.path.splitext(json_path)[0] + ".compiled"
+
+
+def cache_key(json_path, nlp):
+    """
+    Hash of the scenario JSON bytes + the model version + the loaded components
+    (+ the compact vector table, if one is used).
+    If any of these change, the old artifact is simply ignored.
+    """
+    digest = hashlib.sha256()
+    with open(json_path, "rb") as f:
+        digest.update(f.read())
+    model = f"{nlp.meta.get('lang')}_{nlp.meta.get('name')}-{nlp.meta.get('version')}"
+    digest.update(model.encode("utf-8"))
+    digest.update(",".join(nlp.pipe_names).encode("utf-8"))
+    # compact vector tables (DetectiveBrain vectors="int8"/"float16") give other vectors
+    digest.update(getattr(nlp.vocab.vectors, "fingerprint", "").encode("utf-8"))
+    return digest.hexdigest()
+
+
+def save_compiled(path, key, story_indexes):
+    """Writes the story indexes of a scenario into one binary file."""
+    dims = story_indexes[0].vectors.shape[1] if story_indexes else 0
+    header = {
+        "key": key,
+        "dims": dims,
+        "suspects": [
+            {
+                "sentences": index.sentences,
+                "lemmas": [sorted(lemmas) for lemmas in index.lemmas],
+                "rows": len(index.sentences),
+            }
+            for index in story_indexes
+        ],
+    }
+    header_bytes = json.dumps(header).encode("utf-8")
+    offset = len(MAGIC) + 8 + len(header_bytes)
+    padding = (-offset) % ALIGN
+
+    # write to our own temp file first, so a crash never leaves half an artifact
+    # behind and processes writing at the same time never touch each other's file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<Q", len(header_bytes)))
+            f.write(header_bytes)
+            f.write(b"\0" * padding)
+            for index in story_indexes:
+                f.write(np.ascontiguousarray(index.vectors, dtype="float32").tobytes())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def load_compiled(path, key, n_suspects):
+    """
+    Loads the story indexes from the artifact.
+    Returns None if it is missing, broken or was built for other content.
+    """
+    try:
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                return None
+            (header_len,) = struct.unpack("<Q", f.read(8))
+            header = json.loads(f.read(header_len).decode("utf-8"))
+            size = os.fstat(f.fileno()).st_size
+
+        if header.get("key") != key or len(header["suspects"]) != n_suspects:
+            return None
+
+        offset = len(MAGIC) + 8 + header_len
+        offset += (-offset) % ALIGN
+        total_rows = sum(s["rows"] for s in header["suspects"])
+        dims = header["dims"]
+        # a cut-off file (crash, full disk) is rebuilt instead of mapped
+        if size != offset + total_rows * dims * 4:
+            return None
+
+        if total_rows and dims:
+            matrix = np.memmap(path, dtype="float32", mode="r", offset=offset, shape=(total_rows, dims))
+        else:
+            matrix = np.zeros((total_rows, dims), dtype="float32")
+    except (OSError, ValueError, KeyError, TypeError, struct.error):
+        return None
+
+    indexes = []
+    start = 0
+    for s in header["suspects"]:
+        vectors = matrix[start:start + s["rows"]]
+        start += s["rows"]
+        lemmas = [set(l) for l in s["lemmas"]]
+        indexes.append(StoryIndex(s["sentences"], lemmas, vectors))
+    return indexes
+
+
+def remove_compiled(json_path):
+    """Deletes the artifact of a scenario (called when the JSON is overwritten)."""
+    try:
+        os.remove(cache_path(json_path))
+    except OSError:
+        pass
@@ -0,0 +1,166 @@
+"""
+A small stock of ready-made mysteries on disk (data/pool/), refilled in a
+background thread. "Generate NEW Mystery" then just takes one from the pool
+instead of making the player wait 10-20 seconds for the API.
+"""
+import json
+import os
+import threading
+import time
+import uuid
+
+RANDOM_THEME = "A murder mystery with a unique, randomly selected theme and setting."
+
+
+class TokenBucket:
+    """
+    Simple rate limiter: 'rate' requests per minute, bursts up to 'capacity'.
+    pause() empties the bucket until a given time (used after a 429).
+    """
+    def __init__(self, rate_per_minute=2.0, capacity=1, clock=time.monotonic):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.clock = clock
+        self.updated = clock()
+        self.paused_until = 0.0
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return now
+
+    def try_acquire(self):
+        """Takes a token. Returns 0 if that worked, otherwise the seconds to wait."""
+        now = self._refill()
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def pause(self, seconds):
+        self.paused_until = max(self.paused_until, self.clock() + seconds)
+        self.tokens = 0.0
+
+
+class ScenarioPool:
+    """
+    Keeps 'size' generated mysteries in 'directory'.
+    'generate' is any function theme -> scenario dict (or None). Errors with a
+    'retry_after' attribute (generator.QuotaExceeded) pause the refills for that long.
+    Tests can pass a local stub instead of Gemini.
+    """
+    def __init__(self, generate, directory="data/pool", size=3, bucket=None, theme=RANDOM_THEME):
+        self.generate = generate
+        self.directory = directory
+        self.size = size
+        self.bucket = bucket or TokenBucket()
+        self.theme = theme
+
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.stopped = threading.Event()
+        self.thread = None
+        self.last_error = None
+        self.failures = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    # --- reading the pool (UI thread) ---
+
+    def files(self):
+        names = sorted(n for n in os.listdir(self.directory) if n.endswith(".json"))
+        return [os.path.join(self.directory, n) for n in names]
+
+    def available(self):
+        return len(self.files())
+
+    def pop(self):
+        """Takes the oldest ready mystery out of the pool (None if empty)."""
+        with self.lock:
+            for path in self.files():
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                except (OSError, ValueError):
+                    data = None
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                if data:
+                    self.wakeup.set()  # one slot free -> refill
+                    return data
+        return None
+
+    # --- filling the pool (background thread) ---
+
+    def start(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.stopped.clear()
+            self.thread = threading.Thread(target=self._refill_loop, name="scenario-pool", daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self.stopped.set()
+        self.wakeup.set()
+        if self.thread:
+            self.thread.join(timeout)
+
+    def refill_once(self):
+        """
+        Generates at most one mystery if the pool is not full and the rate limit allows.
+        Returns the seconds to wait before trying again (0 = try again right away).
+        """
+        if self.available() >= self.size:
+            return None  # full: sleep until something is popped
+
+        wait = self.bucket.try_acquire()
+        if wait > 0:
+            return wait
+
+        try:
+            data = self.generate(self.theme)
+        except Exception as e:
+            retry_after = getattr(e, "retry_after", None)  # generator.QuotaExceeded
+            if retry_after is not None:
+                # honour the quota instead of hammering the API
+                self.last_error = f"quota exceeded, retrying in {retry_after}s"
+                self.bucket.pause(retry_after)
+                return retry_after
+            data = None
+            self.last_error = str(e)
+
+        if not data:
+            # back off a bit more after every failure (max 10 minutes)
+            self.failures += 1
+            return min(600, 30 * 2 ** (self.failures - 1))
+
+        self.failures = 0
+        self.last_error = None
+        self._store(data)
+        return 0.0
+
+    def _store(self, data):
+        # nanoseconds first, so files() sorts by age even within the same second
+        name = f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.json"
+        path = os.path.join(self.directory, name)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)  # the UI never sees half-written files
+
+    def _refill_loop(self):
+        while not self.stopped.is_set():
+            wait = self.refill_once()
+            if wait == 0:
+                continue
+            self.wakeup.wait(wait)
+            self.wakeup.clear()
+
+    def status(self):
+        return {"ready": self.available(), "size": self.size, "last_error": self.last_error}
@@ -0,0 +1,246 @@
+"""
+Multi-player interrogation server.
+
+One DetectiveBrain (the big spaCy model) and one compiled scenario are loaded
+ONCE and shared by every player. Each session only keeps its own game state:
+turns, score and one small SuspectState (willingness, last_match per suspect).
+
+Start it from the project folder:
+    python -m src.server --port 8000
+
+Then drive it with any HTTP client (JSON in, JSON out):
+    POST   /sessions                    -> start a new game
+    GET    /sessions/<id>               -> turns, score, suspects
+    GET    /metrics  (/metrics.json)    -> parse() stage timings, if started with --metrics
+    POST   /sessions/<id>/ask           {"suspect": 1, "question": "Where were you at 9?"}
+    POST   /sessions/<id>/accuse        {"name": "Dr. Aris Thorne"}
+    DELETE /sessions/<id>               -> end the game
+"""
+import argparse
+import asyncio
+import json
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .batching import BatchScheduler
+from .game import GameError, GameSession
+from .nlp import DEFAULT_PROFILE, PIPELINE_PROFILES, DetectiveBrain
+from .suspect_data import load_scenario
+from .vectors import VECTOR_MODES
+from .worker_pool import WorkerPool
+
+SESSION_TIMEOUT = 30 * 60  # idle sessions are dropped after 30 minutes
+
+
+class InterrogationSession(GameSession):
+    """One player's game (rules in src/game.py) plus what the server needs to keep it."""
+    def __init__(self, session_id, scenario):
+        super().__init__(scenario)
+        self.id = session_id
+        self.last_seen = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def state(self):
+        return dict(super().state(), session=self.id)
+
+
+class InterrogationServer:
+    def __init__(self, brain, scenario, max_batch=16, max_latency=0.005, threads=1):
+        self.brain = brain
+        self.scenario = scenario
+        self.sessions = {}
+        # spaCy runs in background threads, so the event loop never blocks.
+        # With an in-process brain this is ONE thread (the pipeline is never called
+        # from two threads at once); with a WorkerPool one thread per worker process.
+        self.executor = ThreadPoolExecutor(max_workers=threads)
+        # questions from different players arriving together share one nlp.pipe call
+        self.scheduler = BatchScheduler(brain, self.executor, max_batch, max_latency)
+
+    # --- game actions ---
+
+    def new_session(self):
+        self.drop_idle_sessions()
+        session_id = secrets.token_hex(8)
+        session = InterrogationSession(session_id, self.scenario)
+        self.sessions[session_id] = session
+        meta = self.scenario["meta"]
+        return dict(session.state(), title=meta.get("title"), intro_text=meta.get("intro_text"))
+
+    def drop_idle_sessions(self):
+        now = time.monotonic()
+        for session_id in [k for k, s in self.sessions.items() if now - s.last_seen > SESSION_TIMEOUT]:
+            del self.sessions[session_id]
+
+    async def ask(self, session, body):
+        try:
+            suspect, intents, reply = session.start_question(body.get("suspect"), body.get("question", ""))
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        except GameError as e:
+            return 409, {"error": str(e), "outcome": session.outcome}
+
+        if reply["answer"] is None:
+            reply["answer"] = await self.scheduler.parse(str(body["question"]).strip(), suspect, intents)
+        return 200, session.finish_question(reply)
+
+    def accuse(self, session, body):
+        try:
+            return 200, session.accuse(body.get("name", ""))
+        except GameError as e:
+            return 409, {"error": str(e), "outcome": session.outcome}
+
+    # --- HTTP plumbing ---
+
+    async def route(self, method, path, body):
+        parts = [p for p in path.split("?")[0].split("/") if p]
+
+        if method == "GET" and not parts:
+            meta = self.scenario["meta"]
+            cache = getattr(self.brain, "cache", None)
+            return 200, {
+                "title": meta.get("title"),
+                "sessions": len(self.sessions),
+                "batching": self.scheduler.stats(),
+                "answer_cache": cache.stats() if cache else None,
+            }
+
+        if method == "GET" and parts[:1] in (["metrics"], ["metrics.json"]):
+            metrics = getattr(self.brain, "metrics", None)
+            if metrics is None or not metrics.enabled:
+                return 404, {"error": "Metrics are off (start the server with --metrics, without --workers)."}
+            return 200, metrics.to_prometheus() if parts[0] == "metrics" else metrics.to_dict()
+
+        if parts[:1] != ["sessions"]:
+            return 404, {"error": "Not found."}
+
+        if method == "POST" and len(parts) == 1:
+            return 201, self.new_session()
+
+        session = self.sessions.get(parts[1]) if len(parts) > 1 else None
+        if session is None:
+            return 404, {"error": "Unknown session."}
+        session.last_seen = time.monotonic()
+
+        if method == "GET" and len(parts) == 2:
+            return 200, session.state()
+        if method == "DELETE" and len(parts) == 2:
+            del self.sessions[session.id]
+            return 200, {"closed": session.id}
+
+        action = parts[2] if len(parts) == 3 else None
+        if method == "POST" and action == "ask":
+            # one question at a time per player, so turns & willingness stay consistent
+            async with session.lock:
+                return await self.ask(session, body)
+        if method == "POST" and action == "accuse":
+            async with session.lock:
+                return self.accuse(session, body)
+
+        return 404, {"error": "Not found."}
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0) or 0)
+                raw = await reader.readexactly(length) if length else b""
+                try:
+                    body = json.loads(raw) if raw else {}
+                    status, payload = await self.route(method.upper(), path, body)
+                except json.JSONDecodeError:
+                    status, payload = 400, {"error": "Body must be JSON."}
+                except Exception as e:
+                    status, payload = 500, {"error": str(e)}
+
+                if isinstance(payload, str):
+                    # plain text (Prometheus metrics)
+                    data = payload.encode("utf-8")
+                    content_type = "text/plain; version=0.0.4"
+                else:
+                    data = json.dumps(payload).encode("utf-8")
+                    content_type = "application/json"
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status < 400 else 'Error'}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"🕵️  Interrogation server running on http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-player interrogation server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--scenario", default="data/scenario_generated.json")
+    parser.add_argument("--batch-size", type=int, default=16, help="max questions per nlp.pipe call")
+    parser.add_argument("--batch-latency-ms", type=float, default=5.0, help="max wait before a batch is sent")
+    parser.add_argument("--workers", type=int, default=0, help="spaCy worker processes (0 = run in this process)")
+    parser.add_argument("--metrics", action="store_true", help="time the parse() stages, served at /metrics")
+    parser.add_argument("--vectors", choices=VECTOR_MODES, default="full",
+                        help="int8/float16: keep only the word vectors of the scenario (less memory per worker)")
+    parser.add_argument("--profile", choices=list(PIPELINE_PROFILES), default=DEFAULT_PROFILE,
+                        help="fast: skips the spaCy parser for questions (same answers, less CPU)")
+    args = parser.parse_args()
+
+    scenario = load_scenario(args.scenario)
+    if not scenario:
+        print("\n❌ FAILED: No generated story found.")
+        return
+
+    if args.workers > 0:
+        # the model lives in the worker processes only
+        brain = WorkerPool(scenario["path"], workers=args.workers, profile=args.profile, vectors=args.vectors)
+        print(f"Starting {args.workers} worker processes...")
+        brain.warm_up()
+    else:
+        brain = DetectiveBrain(profile=args.profile, vectors=args.vectors)
+        brain.metrics.enabled = args.metrics
+        brain.compile_scenario(scenario["suspects"], source=scenario["path"])
+
+    server = InterrogationServer(
+        brain, scenario,
+        max_batch=args.batch_size,
+        max_latency=args.batch_latency_ms / 1000,
+        threads=max(1, args.workers),
+    )
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if args.workers > 0:
+            brain.close()
+
+
+if __name__ == "__main__":
+    main()
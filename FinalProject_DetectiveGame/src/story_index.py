@@ -0,0 +1,77 @@
+import numpy as np
+
+from .ann import RandomProjectionLSH
+
+
+class StoryIndex:
+    """
+    Pre-processed version of a suspect's story.
+    The story never changes during a game, so we parse it ONCE and keep
+    only what best_sentence needs: the sentence texts, their lemmas and
+    their (normalized) vectors stacked into one matrix.
+    """
+    def __init__(self, sentences, lemmas, vectors):
+        self.sentences = sentences  # list of sentence strings
+        self.lemmas = lemmas        # list of lemma sets (one per sentence)
+        self.vectors = vectors      # (sentences x dims) matrix of unit vectors
+
+        # Set by LemmaIndex when the scenario is compiled
+        self.lemma_index = None
+        self.slot = 0
+
+        # Optional approximate search, only for very big stories (see build_ann)
+        self.ann = None
+
+    @classmethod
+    def from_doc(cls, doc):
+        """Builds the index from an already parsed story Doc."""
+        sentences = []
+        lemmas = []
+        vectors = []
+
+        for sent in doc.sents:
+            sentences.append(sent.text)
+            lemmas.append({t.lemma_ for t in sent})
+            vectors.append(unit_vector(sent))
+
+        if vectors:
+            matrix = np.vstack(vectors).astype("float32")
+        else:
+            matrix = np.zeros((0, doc.vector.shape[0]), dtype="float32")
+        return cls(sentences, lemmas, matrix)
+
+    def scores(self, q_vector, q_lemmas):
+        """
+        Scores all sentences in one pass:
+        cosine similarity (one matrix-vector product) + 3.0 per matching term.
+        """
+        counts = self.lemma_index.match_counts(q_lemmas, self.slot, len(self.sentences))
+        if self.ann is None:
+            return self.vectors.dot(q_vector) + counts * 3.0
+
+        # big story: exact scores only for the ANN candidates + every sentence with a
+        # matching term (so the keyword bonus is never lost); the rest can't win
+        rows = np.union1d(self.ann.candidates(q_vector), np.flatnonzero(counts))
+        scores = np.full(len(self.sentences), -np.inf)
+        scores[rows] = self.vectors[rows].dot(q_vector) + counts[rows] * 3.0
+        return scores
+
+    def build_ann(self, **options):
+        """Builds the LSH index over the sentence vectors (options: n_tables, n_bits, seed)."""
+        self.ann = RandomProjectionLSH(self.vectors, **options) if len(self.sentences) else None
+        return self.ann
+
+    def __len__(self):
+        return len(self.sentences)
+
+
+def unit_vector(span):
+    """
+    Returns the vector of a Doc/Span scaled to length 1.
+    Cosine similarity is then just a dot product. Spans without a vector
+    get a zero vector, so their similarity is 0.0 (same as spaCy does).
+    """
+    norm = span.vector_norm
+    if not norm:
+        return np.zeros(span.vector.shape, dtype="float32")
+    return span.vector / norm
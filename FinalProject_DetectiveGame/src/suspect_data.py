@@ -1,6 +1,6 @@
 import json
 import os
-from .models import Suspect, KnowledgeBase
+from .models import Suspect, SuspectRecord, SuspectState
 
 def load_scenario(filename="data/scenario_generated.json"):
     """
@@ -18,7 +18,14 @@ def load_scenario(filename="data/scenario_generated.json"):
         print("Make sure you run 'generate_story.py' first!")
         return None
 
-    loaded_suspects = []
+    return build_scenario(data, path=file_path)
+
+def build_scenario(data, path=None):
+    """
+    Initializes the Suspect objects of an already parsed scenario dict
+    (e.g. one taken from the ScenarioLibrary).
+    """
+    records = []
 
     for s_data in data["suspects"]:
         clean_sentences = []
@@ -30,12 +37,11 @@ def load_scenario(filename="data/scenario_generated.json"):
             
         full_story_text = " ".join(clean_sentences)
 
-        new_suspect = Suspect(
+        records.append(SuspectRecord(
             id=s_data["id"],
             name=s_data["name"],
             bio=s_data["bio"],
             personality_style=s_data["personality_style"],
-            knowledge=KnowledgeBase(), 
             story_text=full_story_text,
             timeline=s_data["timeline"],
             prefixes=s_data.get("prefixes", []),
@@ -43,13 +49,16 @@ def load_scenario(filename="data/scenario_generated.json"):
             defense_statement=s_data["defense_statement"],
             fallback_statement=s_data["fallback_statement"],
             is_guilty=s_data.get("is_guilty", False)
-        )
-        
-        new_suspect.last_match = None
-        loaded_suspects.append(new_suspect)
+        ))
+
+    # the records are shared by every game; these suspects carry the state of one
+    # game (GameSession makes its own with models.new_game)
+    state = SuspectState(len(records))
+    loaded_suspects = [Suspect(record, state, i) for i, record in enumerate(records)]
 
     return {
         "meta": data.get("meta", {}),
         "outcomes": data.get("outcomes", {}),
-        "suspects": loaded_suspects
+        "suspects": loaded_suspects,
+        "path": path
     }
\ No newline at end of file
@@ -0,0 +1,262 @@
+"""
+Checks a generated mystery before it is saved, and repairs what can be
+repaired without asking the AI again.
+
+validate(data)       -> list of problems (empty = the mystery is playable)
+repair_locally(data) -> fixes trivial mistakes in place, returns what was fixed
+broken_parts(...)    -> which parts (one suspect, the solution, ...) still need a new answer
+"""
+import difflib
+import re
+
+SUSPECT_COUNT = 3
+TIMELINE_HOURS = ["18:00", "19:00", "20:00", "21:00", "22:00", "23:00", "00:00"]
+
+META_FIELDS = ["title", "intro_text", "solution"]
+OUTCOME_FIELDS = ["success", "failure", "timeout"]
+SUSPECT_FIELDS = ["name", "bio", "personality_style", "knowledge_sentences", "timeline",
+                  "defense_statement", "fallback_statement"]
+# the fields the game uses as text (e.g. personality_style.replace(...) in DetectiveBrain.render)
+SUSPECT_TEXT_FIELDS = ["name", "bio", "personality_style", "defense_statement", "fallback_statement"]
+
+
+class Problem:
+    """One thing that is wrong. 'part' is the path of the section that contains it."""
+    def __init__(self, part, message):
+        self.part = part        # e.g. ("suspects", 1) or ("meta", "solution")
+        self.message = message
+
+    def __repr__(self):
+        return f"{'/'.join(str(p) for p in self.part)}: {self.message}"
+
+
+def is_text(value):
+    return isinstance(value, str) and value.strip() != ""
+
+
+def validate(data):
+    """Returns every problem that would break the game (or the rules of the prompt)."""
+    if not isinstance(data, dict):
+        return [Problem((), "not a JSON object")]
+    problems = []
+
+    # --- meta & outcomes ---
+    meta = data.get("meta")
+    if not isinstance(meta, dict):
+        problems.append(Problem(("meta",), "missing"))
+        meta = {}
+    for field in META_FIELDS[:2]:
+        if not is_text(meta.get(field)):
+            problems.append(Problem(("meta",), f"missing {field}"))
+
+    outcomes = data.get("outcomes")
+    if not isinstance(outcomes, dict) or not all(is_text(outcomes.get(f)) for f in OUTCOME_FIELDS):
+        problems.append(Problem(("outcomes",), "missing success / failure / timeout text"))
+
+    # --- suspects ---
+    suspects = data.get("suspects")
+    if not isinstance(suspects, list):
+        suspects = []
+    # every suspect is checked, also extra ones: build_scenario loads all of them
+    for i in range(max(SUSPECT_COUNT, len(suspects))):
+        if i >= len(suspects) or not isinstance(suspects[i], dict):
+            problems.append(Problem(("suspects", i), "missing"))
+            continue
+        problems.extend(validate_suspect(suspects[i], i))
+
+    ids = [s.get("id") for s in suspects if isinstance(s, dict)]
+    if len(set(ids)) != len(ids):
+        problems.append(Problem(("suspects",), "duplicate ids"))
+
+    # --- solution ---
+    solution = meta.get("solution")
+    if not isinstance(solution, dict) or not is_text(solution.get("killer")) or not is_text(solution.get("motive")):
+        problems.append(Problem(("meta", "solution"), "missing killer / motive"))
+    else:
+        guilty = [s for s in suspects if isinstance(s, dict) and s.get("is_guilty") is True]
+        if len(guilty) != 1:
+            problems.append(Problem(("meta", "solution"), f"{len(guilty)} suspects are guilty (must be 1)"))
+        elif guilty[0].get("name") != solution["killer"]:
+            problems.append(Problem(("meta", "solution"), f"killer '{solution['killer']}' is not the guilty suspect"))
+
+    return problems
+
+
+def validate_suspect(suspect, i):
+    problems = []
+    part = ("suspects", i)
+
+    if not is_text(suspect.get("id")):
+        problems.append(Problem(part, "missing id"))
+    for field in SUSPECT_FIELDS:
+        if field not in suspect:
+            problems.append(Problem(part, f"missing {field}"))
+        elif field in SUSPECT_TEXT_FIELDS and not is_text(suspect[field]):
+            problems.append(Problem(part, f"{field} is not a text"))
+
+    sentences = suspect.get("knowledge_sentences")
+    if "knowledge_sentences" in suspect:
+        if not isinstance(sentences, list) or not any(is_text(s) for s in sentences):
+            problems.append(Problem(part, "no knowledge sentences"))
+        elif not all(isinstance(s, str) for s in sentences):
+            problems.append(Problem(part, "a knowledge sentence is not a text"))
+
+    timeline = suspect.get("timeline")
+    if "timeline" in suspect:
+        if not isinstance(timeline, dict):
+            problems.append(Problem(part, "timeline is not an object"))
+        else:
+            missing = [h for h in TIMELINE_HOURS if not is_text(timeline.get(h))]
+            if missing:
+                problems.append(Problem(part, f"timeline is missing {', '.join(missing)}"))
+            elif not all(isinstance(place, str) for place in timeline.values()):
+                problems.append(Problem(part, "a timeline entry is not a text"))
+
+    if not isinstance(suspect.get("is_guilty"), bool):
+        problems.append(Problem(part, "is_guilty is not true / false"))
+    for field in ("prefixes", "suffixes"):
+        if field in suspect and not isinstance(suspect[field], list):
+            problems.append(Problem(part, f"{field} is not a list"))
+        elif not all(isinstance(value, str) for value in suspect.get(field, [])):
+            problems.append(Problem(part, f"{field} are not all texts"))
+    return problems
+
+
+# --- local repair ---
+
+def normalize_hour(key):
+    """'9 PM', '21:00:00', '21h', '9:00pm' -> '21:00' (None if it is no hour at all)."""
+    match = re.match(r"\s*(\d{1,2})(?::\d{2})*\s*(am|pm|h)?\s*$", str(key).lower())
+    if not match:
+        return None
+    hour = int(match.group(1))
+    if match.group(2) == "pm" and hour < 12:
+        hour += 12
+    if match.group(2) == "am" and hour == 12:
+        hour = 0
+    return f"{hour % 24:02d}:00"
+
+
+def slug(name):
+    return re.sub(r"[^a-z0-9]+", "_", str(name).lower()).strip("_") or "suspect"
+
+
+def repair_timeline(suspect):
+    """Normalizes the hour keys and fills missing hours with the nearest known place."""
+    timeline = suspect.get("timeline")
+    if not isinstance(timeline, dict) or not timeline:
+        return False
+
+    fixed = {}
+    for key, place in timeline.items():
+        hour = normalize_hour(key)
+        if hour and is_text(place):
+            fixed.setdefault(hour, place.strip())
+    known = [h for h in TIMELINE_HOURS if h in fixed]
+    if not known:
+        return False
+
+    for i, hour in enumerate(TIMELINE_HOURS):
+        if hour not in fixed:
+            # still where they were before (or where they are next, at the start of the evening)
+            earlier = [h for h in TIMELINE_HOURS[:i] if h in known]
+            fixed[hour] = fixed[earlier[-1] if earlier else known[0]]
+
+    ordered = {h: fixed[h] for h in TIMELINE_HOURS}
+    ordered.update((h, place) for h, place in fixed.items() if h not in ordered)  # e.g. 20:30
+    if ordered == timeline:
+        return False
+    suspect["timeline"] = ordered
+    return True
+
+
+def repair_locally(data):
+    """
+    Fixes everything that does not need new text from the AI.
+    Changes 'data' in place and returns a list of what was fixed.
+    """
+    fixed = []
+    if not isinstance(data, dict):
+        return fixed
+    suspects = [s for s in data.get("suspects", []) if isinstance(s, dict)] if isinstance(data.get("suspects"), list) else []
+
+    used_ids = set()
+    for i, suspect in enumerate(suspects):
+        # ids: missing or duplicate -> made from the name
+        if not is_text(suspect.get("id")) or suspect["id"] in used_ids:
+            new_id = base = slug(suspect.get("name") or f"suspect_{i + 1}")
+            n = 2
+            while new_id in used_ids:
+                new_id, n = f"{base}_{n}", n + 1
+            suspect["id"] = new_id
+            fixed.append(f"suspect {i + 1}: id set to '{new_id}'")
+        used_ids.add(suspect["id"])
+
+        if isinstance(suspect.get("is_guilty"), str):
+            suspect["is_guilty"] = suspect["is_guilty"].strip().lower() == "true"
+            fixed.append(f"suspect {i + 1}: is_guilty converted to true / false")
+
+        if isinstance(suspect.get("knowledge_sentences"), str):
+            text = suspect["knowledge_sentences"]
+            suspect["knowledge_sentences"] = [s for s in re.split(r"(?<=[.!?])\s+", text) if s.strip()]
+            fixed.append(f"suspect {i + 1}: knowledge_sentences split into a list")
+
+        for field in ("prefixes", "suffixes"):
+            value = suspect.get(field)
+            if value is None or isinstance(value, str):
+                suspect[field] = [value] if is_text(value) else []
+                fixed.append(f"suspect {i + 1}: {field} turned into a list")
+
+        if repair_timeline(suspect):
+            fixed.append(f"suspect {i + 1}: timeline hours fixed")
+
+    fixed.extend(repair_solution(data, suspects))
+    return fixed
+
+
+def repair_solution(data, suspects):
+    """Makes solution.killer and the is_guilty flags agree, if one of them is clear."""
+    meta = data.get("meta")
+    solution = meta.get("solution") if isinstance(meta, dict) else None
+    if not isinstance(solution, dict) or not suspects:
+        return []
+
+    names = [str(s.get("name", "")) for s in suspects]
+    guilty = [s for s in suspects if s.get("is_guilty") is True]
+    killer = solution.get("killer")
+
+    # which suspect does the killer name mean? ("Thorne" / "Dr Aris Thorn" -> "Dr. Aris Thorne")
+    match = None
+    if is_text(killer):
+        lowered = [n.lower() for n in names]
+        contains = [n for n, low in zip(names, lowered) if killer.lower() in low or low in killer.lower()]
+        close = difflib.get_close_matches(killer, names, n=1, cutoff=0.6)
+        if len(contains) == 1:
+            match = contains[0]
+        elif close:
+            match = close[0]
+
+    if len(guilty) == 1 and guilty[0].get("name") == killer:
+        return []
+    if match:
+        # the solution names someone -> that person is the (only) guilty one
+        for s in suspects:
+            s["is_guilty"] = s.get("name") == match
+        solution["killer"] = match
+        return [f"solution: killer is '{match}', is_guilty flags set to match"]
+    if len(guilty) == 1 and is_text(guilty[0].get("name")):
+        solution["killer"] = guilty[0]["name"]
+        return [f"solution: killer set to the guilty suspect '{guilty[0]['name']}'"]
+    return []
+
+
+def broken_parts(problems):
+    """The sections that have to be asked for again, one request each (in order)."""
+    parts = []
+    for problem in problems:
+        part = problem.part
+        if part == ("suspects",) or part == ():
+            part = ()  # only a whole new mystery helps
+        if part not in parts:
+            parts.append(part)
+    return parts
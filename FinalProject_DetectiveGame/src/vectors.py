@@ -0,0 +1,205 @@
+"""
+Smaller word-vector table for DetectiveBrain (the "int8"/"float16" vector modes).
+
+en_core_web_md keeps 20,000 float32 vectors (plus a key table for ~500,000
+words) in every process, but a game only ever compares questions with the
+sentences of its own stories. compact_vectors() therefore:
+  1. keeps only the rows for the words of our scenarios, question corpus and
+     word lists,
+  2. points every other word to the nearest kept row (cosine), so unknown
+     words still get a sensible vector,
+  3. stores the kept rows as int8 with one scale per row (or as float16).
+
+CompactVectors plugs into spaCy as nlp.vocab.vectors (spacy.vectors.BaseVectors,
+spaCy >= 3.7): Token/Span/Doc .vector and the static-vector features of the
+tagger read from it like from the normal table.
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+from spacy.vectors import BaseVectors, Vectors
+
+VECTOR_MODES = ("full", "float16", "int8")
+ROW_CACHE_SIZE = 50000
+
+# the detective questions of the benchmarks: typical player words are kept too
+QUESTION_CORPUS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "questions.json")
+
+
+class CompactVectors(BaseVectors):
+    def __init__(self, keys, rows, table, scales=None, attr=None, fingerprint=""):
+        super().__init__()
+        # sorted key array + searchsorted instead of a dict: ~12 bytes per word
+        order = np.argsort(keys, kind="stable")
+        self.keys = np.ascontiguousarray(keys[order], dtype="uint64")
+        self.rows = np.ascontiguousarray(rows[order], dtype=np.min_scalar_type(max(len(table) - 1, 0)))
+        self.table = table      # (kept rows x dims) int8 or float16
+        self.scales = scales    # float32 per row (int8 only)
+        self.attr = attr
+        self.fingerprint = fingerprint
+        self.name = f"compact-{table.dtype.name}"
+        self.mode = "compact"  # shown in nlp.meta; spaCy only treats "default"/"floret" specially
+        # Token.vector asks for one key at a time: remember the row of the words seen
+        self.row_cache = {}
+
+    # --- lookups ---
+
+    def find_rows(self, keys):
+        """Row of every key, -1 for keys without a vector."""
+        keys = np.asarray(keys, dtype="uint64")
+        if not len(self.keys):
+            return np.full(keys.shape, -1, dtype="int64")
+        idx = np.searchsorted(self.keys, keys)
+        idx[idx == len(self.keys)] = 0
+        return np.where(self.keys[idx] == keys, self.rows[idx].astype("int64"), -1)
+
+    def vectors_for_rows(self, rows):
+        out = self.table[rows].astype("float32")
+        if self.scales is not None:
+            out *= self.scales[rows][:, None]
+        return out
+
+    def get_batch(self, keys):
+        rows = self.find_rows(keys)
+        out = self.vectors_for_rows(np.maximum(rows, 0))
+        out[rows < 0] = 0
+        return out
+
+    def find_row(self, key):
+        row = self.row_cache.get(key)
+        if row is None:
+            row = int(self.find_rows([key])[0])
+            if len(self.row_cache) < ROW_CACHE_SIZE:
+                self.row_cache[key] = row
+        return row
+
+    def __getitem__(self, key):
+        row = self.find_row(key)
+        if row < 0:
+            raise KeyError(key)
+        vector = self.table[row].astype("float32")
+        if self.scales is not None:
+            vector *= self.scales[row]
+        return vector
+
+    def __contains__(self, key):
+        return self.find_row(key) >= 0
+
+    # --- what spaCy asks about the table ---
+
+    @property
+    def data(self):
+        # spaCy only looks at this to choose numpy or cupy
+        return self.table
+
+    @property
+    def shape(self):
+        return self.table.shape
+
+    @property
+    def vectors_length(self):
+        return self.table.shape[1]
+
+    @property
+    def size(self):
+        return self.table.size
+
+    @property
+    def n_keys(self):
+        return len(self.keys)
+
+    def __len__(self):
+        return len(self.table)
+
+    def is_full(self):
+        return True
+
+    def add(self, key, *, vector=None):
+        raise ValueError("CompactVectors is read-only; compact again to add words.")
+
+    def nbytes(self):
+        total = self.keys.nbytes + self.rows.nbytes + self.table.nbytes
+        return total + (self.scales.nbytes if self.scales is not None else 0)
+
+
+def table_nbytes(vectors):
+    """Memory of a vector table: the vector data plus the key -> row map."""
+    if isinstance(vectors, CompactVectors):
+        return vectors.nbytes()
+    # spaCy's key2row is a C hash map: ~16 bytes per key (key + row), load factor ~0.5
+    return int(vectors.data.nbytes + vectors.n_keys * 16 * 2)
+
+
+def corpus_questions(path=QUESTION_CORPUS):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return [q for questions in json.load(f).values() for q in questions]
+    except (OSError, ValueError):
+        return []
+
+
+def vocabulary_keys(nlp, texts):
+    """The vector keys (orth and lowercase) of every word in the texts - only the tokenizer runs."""
+    keys = set()
+    for doc in nlp.tokenizer.pipe(texts):
+        for token in doc:
+            keys.add(token.orth)
+            keys.add(token.lower)
+    return keys
+
+
+def nearest_rows(data, keep_rows, other_rows, batch_size=1024):
+    """For every row in other_rows: the index (into keep_rows) of the most similar kept vector."""
+    kept = data[keep_rows]
+    kept = kept / np.maximum(np.linalg.norm(kept, axis=1, keepdims=True), 1e-8)
+    nearest = np.zeros(len(other_rows), dtype="int64")
+    for start in range(0, len(other_rows), batch_size):
+        batch = data[other_rows[start:start + batch_size]]
+        nearest[start:start + batch_size] = (batch @ kept.T).argmax(axis=1)
+    return nearest
+
+
+def compact_vectors(nlp, texts, mode="int8", batch_size=1024):
+    """
+    Replaces nlp.vocab.vectors with a CompactVectors table that keeps the rows for
+    the words in 'texts' and remaps all other words to their nearest kept row.
+    Returns (bytes before, bytes after).
+    """
+    if mode not in VECTOR_MODES[1:]:
+        raise ValueError(f"Unknown vector mode '{mode}' (use one of {', '.join(VECTOR_MODES)})")
+    vectors = nlp.vocab.vectors
+    if not isinstance(vectors, Vectors) or vectors.mode != "default" or not vectors.n_keys:
+        raise ValueError("Only a normal spaCy vector table can be compacted.")
+    before = table_nbytes(vectors)
+
+    data = np.asarray(vectors.data, dtype="float32")
+    pairs = np.array(list(vectors.key2row.items()), dtype="uint64").reshape(-1, 2)
+    keys, key_rows = pairs[:, 0], pairs[:, 1].astype("int64")
+
+    wanted = np.array(sorted(vocabulary_keys(nlp, texts)), dtype="uint64")
+    keep_rows = np.unique(key_rows[np.isin(keys, wanted)])
+    if not len(keep_rows):
+        raise ValueError("None of the words have a vector; nothing to keep.")
+
+    # old row -> new row: kept rows are renumbered, the rest go to their nearest kept row
+    row_map = np.zeros(len(data), dtype="int64")
+    row_map[keep_rows] = np.arange(len(keep_rows))
+    used_rows = np.unique(key_rows)
+    other_rows = np.setdiff1d(used_rows, keep_rows)
+    if len(other_rows):
+        row_map[other_rows] = nearest_rows(data, keep_rows, other_rows, batch_size)
+
+    kept = data[keep_rows]
+    if mode == "int8":
+        scales = np.abs(kept).max(axis=1) / 127
+        scales[scales == 0] = 1
+        table = np.round(kept / scales[:, None]).astype("int8")
+        scales = scales.astype("float32")
+    else:
+        table, scales = kept.astype("float16"), None
+
+    fingerprint = hashlib.sha256(wanted.tobytes() + mode.encode("utf-8")).hexdigest()[:16]
+    nlp.vocab.vectors = CompactVectors(keys, row_map[key_rows], table, scales, attr=vectors.attr, fingerprint=fingerprint)
+    return before, table_nbytes(nlp.vocab.vectors)
@@ -0,0 +1,126 @@
+"""
+Runs DetectiveBrain in several worker processes, so spaCy can use every CPU
+core instead of being stuck behind the GIL of one process.
+
+Every worker loads the pipeline and the compiled scenario once (the first one
+builds the .compiled artifact, the others wait and load it). The game state
+of a suspect (willingness, last_match) is sent along with each question and
+sent back with the answer, so ANY worker can answer ANY session.
+"""
+import copy
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .nlp import DEFAULT_PROFILE, DetectiveBrain
+from .scenario_cache import cache_path
+from .suspect_data import load_scenario
+
+# how long a worker waits for another one to write the compiled scenario
+COMPILE_LOCK_TIMEOUT = 300.0
+
+# --- state inside each worker process ---
+_brain = None
+_scenarios = {}
+
+
+def _init_worker(profile, vectors, cache_size, scenario_path):
+    """Runs once in every worker process: loads the model AND compiles the scenario."""
+    global _brain
+    _brain = DetectiveBrain(profile=profile, vectors=vectors, cache_size=cache_size)
+    _compile_once(scenario_path)
+
+
+def _compile_once(scenario_path):
+    """
+    All workers start at the same time. The one that creates the lock file
+    compiles the scenario and writes the artifact; the others wait until the
+    lock is gone and then just load it. After COMPILE_LOCK_TIMEOUT (e.g. a lock
+    left behind by a crash) a worker compiles by itself.
+    """
+    lock_path = cache_path(scenario_path) + ".lock"
+    try:
+        fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        deadline = time.monotonic() + COMPILE_LOCK_TIMEOUT
+        while os.path.exists(lock_path) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        return _worker_suspects(scenario_path)
+    try:
+        return _worker_suspects(scenario_path)
+    finally:
+        os.close(fd)
+        os.remove(lock_path)
+
+
+def _worker_suspects(scenario_path):
+    """Loads and compiles a scenario the first time a worker needs it."""
+    if scenario_path not in _scenarios:
+        scenario = load_scenario(scenario_path)
+        _brain.compile_scenario(scenario["suspects"], source=scenario["path"])
+        _scenarios[scenario_path] = {s.id: s for s in scenario["suspects"]}
+    return _scenarios[scenario_path]
+
+
+def _warm_up():
+    return os.getpid()
+
+
+def _parse_in_worker(scenario_path, requests):
+    """
+    requests: list of (msg, suspect id, willingness, last_match, intents)
+    returns:  list of (answer, willingness, last_match)
+    """
+    suspects = _worker_suspects(scenario_path)
+    batch = []
+    intents = []
+    for msg, suspect_id, willingness, last_match, found in requests:
+        suspect = copy.copy(suspects[suspect_id])
+        suspect.willingness = willingness
+        suspect.last_match = last_match
+        batch.append((msg, suspect))
+        intents.append(found)
+
+    answers = _brain.parse_batch(batch, intents)
+    return [(answer, s.willingness, s.last_match) for answer, (_, s) in zip(answers, batch)]
+
+
+class WorkerPool:
+    """
+    Drop-in for DetectiveBrain.parse / parse_batch that sends the work to
+    'workers' processes. Can be used by BatchScheduler like a normal brain
+    (give the scheduler an executor with as many threads as workers).
+    """
+    def __init__(self, scenario_path, workers=None, profile=DEFAULT_PROFILE, vectors="full", cache_size=2048):
+        self.scenario_path = scenario_path
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker, initargs=(profile, vectors, cache_size, scenario_path)
+        )
+
+    def warm_up(self):
+        """
+        Starts the worker processes before the first player arrives. Each one is
+        warm as soon as it exists (the initializer loads the model and the scenario),
+        so it doesn't matter which worker gets which of these jobs.
+        """
+        jobs = [self.pool.submit(_warm_up) for _ in range(self.workers)]
+        return {job.result() for job in jobs}
+
+    def parse_batch(self, requests, intents=None):
+        intents = intents or [None] * len(requests)
+        payload = [(msg, s.id, s.willingness, s.last_match, found) for (msg, s), found in zip(requests, intents)]
+        results = self.pool.submit(_parse_in_worker, self.scenario_path, payload).result()
+
+        answers = []
+        for (answer, willingness, last_match), (_, suspect) in zip(results, requests):
+            suspect.willingness = willingness
+            suspect.last_match = last_match
+            answers.append(answer)
+        return answers
+
+    def parse(self, msg, suspect, intents=None):
+        return self.parse_batch([(msg, suspect)], [intents])[0]
+
+    def close(self):
+        self.pool.shutdown()
@@ -0,0 +1,32 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIO = os.path.join(PROJECT_DIR, "data", "scenario_generated.json")
+
+if PROJECT_DIR not in sys.path:
+    sys.path.insert(0, PROJECT_DIR)
+
+
+@pytest.fixture(scope="session")
+def brain():
+    """One DetectiveBrain for all tests (skipped without spaCy's model)."""
+    pytest.importorskip("spacy")
+    from src.nlp import MODEL_NAME, DetectiveBrain
+    if importlib.util.find_spec(MODEL_NAME) is None:
+        pytest.skip(f"spaCy model '{MODEL_NAME}' is not installed")
+    return DetectiveBrain()
+
+
+@pytest.fixture
+def suspects(brain):
+    """The suspects of the saved mystery, compiled, with a fresh game state."""
+    from src.suspect_data import load_scenario
+    suspects = load_scenario(SCENARIO)["suspects"]
+    brain.compile_scenario(suspects)
+    brain.cache.clear()
+    brain.metrics.reset()
+    return suspects
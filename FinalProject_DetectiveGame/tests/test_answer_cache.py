@@ -0,0 +1,45 @@
+import pytest
+
+from src.answer_cache import AnswerCache
+
+
+@pytest.fixture
+def suspect(suspects):
+    return suspects[0]
+
+
+def branches(brain):
+    return [outcome[0] for _, outcome in brain.cache.entries.values()]
+
+
+def test_normalize_keeps_punctuation_between_digits():
+    cache = AnswerCache()
+    assert cache.normalize("Where were you at 8.30?") == "where were you at 8.30"
+    assert cache.normalize("Where were you at 8.30?") != cache.normalize("Where were you at 830?")
+    assert cache.normalize("Hello, you!") == "hello you"
+
+
+def test_key_contains_the_facts():
+    cache = AnswerCache()
+
+    class Suspect:
+        id = "butler"
+        story_text = "I was in the kitchen."
+
+    assert cache.key(Suspect, "at 9", ("21:00", frozenset())) != cache.key(Suspect, "at 9", (None, frozenset()))
+
+
+def test_830_does_not_reuse_the_answer_for_8_30(brain, suspect):
+    brain.parse("Where were you at 8.30?", suspect)
+    assert branches(brain) == ["time"]
+
+    brain.parse("Where were you at 830?", suspect)
+    assert brain.cache.stats()["size"] == 2
+    assert branches(brain)[1] != "time"
+
+
+def test_repeated_question_is_a_hit(brain, suspect):
+    hits = brain.cache.hits
+    brain.parse("Where were you at 9?", suspect)
+    brain.parse("where were you at 9", suspect)
+    assert brain.cache.hits == hits + 1
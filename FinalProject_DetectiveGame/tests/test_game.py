@@ -0,0 +1,36 @@
+import json
+
+import pytest
+
+from conftest import SCENARIO
+from src.game import GameSession
+from src.suspect_data import build_scenario
+
+with open(SCENARIO, encoding="utf-8") as f:
+    MYSTERY = json.load(f)
+
+
+@pytest.fixture
+def game():
+    # no brain: insults and lookups are decided by the rules alone
+    return GameSession(build_scenario(MYSTERY))
+
+
+def test_find_suspect_by_number_and_name(game):
+    first, second = game.suspects[0], game.suspects[1]
+    assert game.find_suspect(1) is first
+    assert game.find_suspect(" 2 ") is second
+    assert game.find_suspect(second.name.split()[-1].upper()) is second
+    assert game.find_suspect(99) is None
+    assert game.find_suspect("nobody at all") is None
+
+
+@pytest.mark.parametrize("ref", ["", "   ", "\t\n"])
+def test_empty_suspect_is_rejected(game, ref):
+    with pytest.raises(ValueError):
+        game.find_suspect(ref)
+    with pytest.raises(ValueError):
+        game.ask(ref, "Where were you?")
+    # a rejected question costs nothing
+    assert game.turns_left == game.start_turns
+    assert all(s.state.questions[s.slot] == 0 for s in game.suspects)
@@ -0,0 +1,102 @@
+import json
+
+import pytest
+
+from conftest import SCENARIO
+from src.json_stream import (ANY, MYSTERY_PREVIEW, IncompleteJSON, StreamingJSON,
+                             fake_stream, parse_stream, salvage)
+
+with open(SCENARIO, encoding="utf-8") as f:
+    MYSTERY = json.load(f)
+TEXT = json.dumps(MYSTERY, indent=2)
+
+# quotes, backslashes, unicode escapes and brackets inside strings
+TRICKY = {
+    "meta": {"title": 'The "Quoted" Case \\ {not} [a list]', "intro_text": "café \\\"x\\\" \n tab\t end"},
+    "suspects": [{"name": "A,B", "age": 41, "ok": True}, {"name": "}{][", "age": -2.5e3, "ok": None}],
+}
+
+
+def feed_all(parser, chunks):
+    events = []
+    for chunk in chunks:
+        events += parser.feed(chunk)
+    return events
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 32, 1000])
+def test_any_chunk_size_gives_the_same_document(chunk_size):
+    parser = StreamingJSON(MYSTERY_PREVIEW)
+    events = feed_all(parser, fake_stream(TEXT, chunk_size))
+    assert parser.value == MYSTERY
+    assert [path for path, _ in events] == [("meta", "title"), ("meta", "intro_text"),
+                                            ("suspects", 0), ("suspects", 1), ("suspects", 2)]
+
+
+def test_split_at_every_position_inside_strings_and_escapes():
+    text = json.dumps(TRICKY, ensure_ascii=True)  # é and \" as escape sequences
+    assert "\\u00e9" in text and '\\"' in text
+    for cut in range(len(text) + 1):
+        parser = StreamingJSON([("meta", "title"), ("meta", "intro_text"), ("suspects", ANY)])
+        events = feed_all(parser, [text[:cut], text[cut:]])
+        assert parser.value == TRICKY, cut
+        assert dict(events) == {
+            ("meta", "title"): TRICKY["meta"]["title"],
+            ("meta", "intro_text"): TRICKY["meta"]["intro_text"],
+            ("suspects", 0): TRICKY["suspects"][0],
+            ("suspects", 1): TRICKY["suspects"][1],
+        }, cut
+
+
+def test_text_before_the_document_is_skipped():
+    parser = StreamingJSON()
+    feed_all(parser, fake_stream("```json\n" + TEXT + "\n```", 5))
+    assert parser.value == MYSTERY
+
+
+def test_parse_stream_reports_each_suspect_when_it_is_complete():
+    received = []
+    seen = []  # (path, value, chars received when it was reported)
+
+    def stream():
+        for chunk in fake_stream(TEXT, 16):
+            received.append(chunk)
+            yield chunk
+
+    def on_value(path, value):
+        seen.append((path, value, len("".join(received))))
+
+    data, stats = parse_stream(stream(), MYSTERY_PREVIEW, on_value)
+    assert data == MYSTERY
+    suspects = [(path, value, read) for path, value, read in seen if path[0] == "suspects"]
+    assert [path for path, _, _ in suspects] == [("suspects", i) for i in range(3)]
+    for (path, value, read), suspect in zip(suspects, MYSTERY["suspects"]):
+        assert value == suspect
+        # reported before the rest of the document arrived
+        assert read < len(TEXT)
+    assert all(path != ("meta", "solution") for path, _, _ in seen)
+    assert stats["first_content_s"] is not None
+    assert stats["chars"] == len(TEXT)
+
+
+def test_parse_stream_raises_on_a_cut_off_document():
+    cut = TEXT[:len(TEXT) // 2]
+    with pytest.raises(IncompleteJSON) as info:
+        parse_stream(fake_stream(cut, 32), MYSTERY_PREVIEW)
+    assert info.value.text == cut
+
+
+def test_salvage_keeps_the_complete_suspects():
+    # cut in the middle of the last suspect's name
+    name = MYSTERY["suspects"][2]["name"]
+    cut = TEXT[:TEXT.index(json.dumps(name)) + len(name) // 2]
+    data = salvage(cut)
+    assert data["meta"] == MYSTERY["meta"]
+    assert data["outcomes"] == MYSTERY["outcomes"]
+    assert data["suspects"] == MYSTERY["suspects"][:2]
+
+
+def test_salvage_of_a_complete_or_empty_document():
+    assert salvage(TEXT) == MYSTERY
+    assert salvage('{"meta": {"title": "Half') is None
+    assert salvage("") is None
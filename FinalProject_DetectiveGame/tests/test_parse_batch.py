@@ -0,0 +1,27 @@
+import random
+
+
+def test_batch_counts_branches_and_cache_hits(brain, suspects):
+    butler = suspects[0]
+    hits = brain.cache.hits
+    brain.metrics.enabled = True
+    try:
+        brain.parse_batch([("Where were you at 9?", butler), ("Did you kill him?", suspects[1])])
+        brain.parse_batch([("where were you at 9", butler)])  # a cache hit
+    finally:
+        brain.metrics.enabled = False
+
+    assert brain.cache.hits == hits + 1
+    assert brain.metrics.branches == {"time": 2, "accusation": 1}
+    assert brain.metrics.stages["time"].n == 2  # decide() only ran for the two misses
+
+
+def test_batch_gives_the_same_answers_as_parse(brain, suspects):
+    questions = ["Hello", "Where were you at 8?", "Did you kill him?", "Who do you think did it?"]
+    random.seed(0)
+    batched = brain.parse_batch([(q, suspects[2]) for q in questions])
+
+    brain.cache.clear()
+    suspects[2].last_match = None
+    random.seed(0)
+    assert batched == [brain.parse(q, suspects[2]) for q in questions]
@@ -0,0 +1,44 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.scenario_cache import load_compiled, save_compiled
+from src.story_index import StoryIndex
+
+
+def make_indexes():
+    rng = np.random.default_rng(0)
+    return [
+        StoryIndex(["I was in the garden.", "I saw nobody."], [{"garden"}, {"see", "nobody"}], rng.random((2, 4), dtype="float32")),
+        StoryIndex(["I slept."], [{"sleep"}], rng.random((1, 4), dtype="float32")),
+    ]
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "scenario.compiled")
+    indexes = make_indexes()
+    save_compiled(path, "key", indexes)
+
+    loaded = load_compiled(path, "key", 2)
+    assert [i.sentences for i in loaded] == [i.sentences for i in indexes]
+    assert np.array_equal(loaded[0].vectors, indexes[0].vectors)
+    assert load_compiled(path, "other key", 2) is None
+
+
+def test_cut_off_file_is_not_mapped(tmp_path):
+    path = str(tmp_path / "scenario.compiled")
+    save_compiled(path, "key", make_indexes())
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 8)
+
+    assert load_compiled(path, "key", 2) is None
+
+
+def test_writers_at_the_same_time(tmp_path):
+    path = str(tmp_path / "scenario.compiled")
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda _: save_compiled(path, "key", make_indexes()), range(32)))
+
+    assert len(load_compiled(path, "key", 2)) == 2
+    assert os.listdir(tmp_path) == ["scenario.compiled"]  # no temp files left behind
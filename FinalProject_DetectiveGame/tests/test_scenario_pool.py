@@ -0,0 +1,140 @@
+import pytest
+
+from src.generator import QuotaExceeded
+from src.scenario_pool import ScenarioPool, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class StubGenerator:
+    """Stands in for Gemini: returns numbered mysteries, or raises what it was told to."""
+    def __init__(self):
+        self.calls = 0
+        self.error = None
+
+    def __call__(self, theme):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return {"title": f"Case {self.calls}", "n": self.calls}
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def generate():
+    return StubGenerator()
+
+
+@pytest.fixture
+def pool(tmp_path, clock, generate):
+    # 60 per minute = one token per second, no burst
+    bucket = TokenBucket(rate_per_minute=60, capacity=1, clock=clock)
+    return ScenarioPool(generate, directory=str(tmp_path / "pool"), size=3, bucket=bucket)
+
+
+def fill(pool, clock):
+    """Runs refill_once like the background thread does, with the fake clock jumping over every wait."""
+    for _ in range(100):
+        wait = pool.refill_once()
+        if wait is None:
+            return
+        clock.now += wait
+    raise AssertionError("pool never got full")
+
+
+def test_token_bucket_throttles(clock):
+    bucket = TokenBucket(rate_per_minute=2, capacity=1, clock=clock)
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == pytest.approx(30)
+    clock.now += 10
+    assert bucket.try_acquire() == pytest.approx(20)
+    clock.now += 20
+    assert bucket.try_acquire() == 0
+
+
+def test_token_bucket_burst_is_capped(clock):
+    bucket = TokenBucket(rate_per_minute=60, capacity=2, clock=clock)
+    clock.now += 3600  # a long idle time still only gives 'capacity' tokens
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() > 0
+
+
+def test_refill_stops_at_size(pool, clock, generate):
+    fill(pool, clock)
+    assert pool.available() == 3
+    assert generate.calls == 3
+    assert pool.refill_once() is None
+    assert generate.calls == 3
+    assert pool.status() == {"ready": 3, "size": 3, "last_error": None}
+
+
+def test_refill_waits_for_a_token(pool, clock, generate):
+    assert pool.refill_once() == 0
+    wait = pool.refill_once()
+    assert wait == pytest.approx(1)
+    assert generate.calls == 1
+    assert pool.available() == 1
+
+
+def test_pop_takes_the_oldest(pool, clock):
+    fill(pool, clock)
+    assert [pool.pop()["n"] for _ in range(3)] == [1, 2, 3]
+    assert pool.pop() is None
+    assert pool.wakeup.is_set()  # the refill thread is woken up after a pop
+
+
+def test_pop_refills_the_free_slot(pool, clock, generate):
+    fill(pool, clock)
+    pool.pop()
+    fill(pool, clock)
+    assert pool.available() == 3
+    assert generate.calls == 4
+
+
+def test_pop_skips_broken_files(pool, clock):
+    fill(pool, clock)
+    with open(pool.files()[0], "w", encoding="utf-8") as f:
+        f.write('{"title": "cut off')
+    assert pool.pop()["n"] == 2
+    assert pool.available() == 1
+
+
+def test_quota_pauses_the_refills(pool, clock, generate):
+    generate.error = QuotaExceeded("429", retry_after=120)
+    assert pool.refill_once() == 120
+    assert "quota" in pool.last_error
+    assert generate.calls == 1
+
+    # the API recovered, but the pool waits out the pause anyway
+    generate.error = None
+    clock.now += 60
+    assert pool.refill_once() == pytest.approx(60)
+    assert generate.calls == 1
+
+    clock.now += 60
+    assert pool.refill_once() == 0
+    assert generate.calls == 2
+    assert pool.available() == 1
+    assert pool.last_error is None
+
+
+def test_failures_back_off(pool, clock, generate):
+    generate.error = RuntimeError("bad JSON")
+    waits = []
+    for _ in range(3):
+        waits.append(pool.refill_once())
+        clock.now += waits[-1]
+    assert waits == [30, 60, 120]
+    assert pool.last_error == "bad JSON"
+    assert pool.available() == 0
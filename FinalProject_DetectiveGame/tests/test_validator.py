@@ -0,0 +1,76 @@
+import copy
+import json
+import os
+
+import pytest
+
+from conftest import PROJECT_DIR
+from src.suspect_data import build_scenario
+from src.validator import validate
+
+with open(os.path.join(PROJECT_DIR, "data", "scenario_generated.json"), encoding="utf-8") as f:
+    MYSTERY = json.load(f)
+
+
+@pytest.fixture
+def mystery():
+    return copy.deepcopy(MYSTERY)
+
+
+def messages(problems, part):
+    return [p.message for p in problems if p.part == part]
+
+
+def test_saved_mystery_is_valid(mystery):
+    assert validate(mystery) == []
+    build_scenario(mystery)
+
+
+def test_extra_suspect_is_checked(mystery):
+    extra = copy.deepcopy(mystery["suspects"][0])
+    extra["id"] = "extra"
+    del extra["knowledge_sentences"]
+    mystery["suspects"].append(extra)
+
+    assert messages(validate(mystery), ("suspects", 3)) == ["missing knowledge_sentences"]
+
+
+def test_valid_extra_suspect_passes(mystery):
+    extra = copy.deepcopy(mystery["suspects"][0])
+    extra["id"] = "extra"
+    extra["is_guilty"] = False
+    mystery["suspects"].append(extra)
+
+    assert validate(mystery) == []
+    assert len(build_scenario(mystery)["suspects"]) == 4
+
+
+@pytest.mark.parametrize("field", ["name", "bio", "personality_style", "defense_statement", "fallback_statement"])
+def test_text_fields_must_be_text(mystery, field):
+    mystery["suspects"][1][field] = None
+    assert f"{field} is not a text" in messages(validate(mystery), ("suspects", 1))
+
+
+def test_knowledge_sentences_must_all_be_text(mystery):
+    mystery["suspects"][2]["knowledge_sentences"].append(42)
+    assert messages(validate(mystery), ("suspects", 2)) == ["a knowledge sentence is not a text"]
+
+
+def test_knowledge_sentences_must_not_be_empty(mystery):
+    mystery["suspects"][2]["knowledge_sentences"] = []
+    assert messages(validate(mystery), ("suspects", 2)) == ["no knowledge sentences"]
+
+
+def test_prefixes_must_be_text(mystery):
+    mystery["suspects"][0]["prefixes"] = ["Well...", None]
+    assert messages(validate(mystery), ("suspects", 0)) == ["prefixes are not all texts"]
+
+
+def test_timeline_entries_must_be_text(mystery):
+    mystery["suspects"][0]["timeline"]["20:30"] = ["hall"]
+    assert messages(validate(mystery), ("suspects", 0)) == ["a timeline entry is not a text"]
+
+
+def test_missing_suspect(mystery):
+    del mystery["suspects"][2]
+    assert messages(validate(mystery), ("suspects", 2)) == ["missing"]